@@ -0,0 +1,415 @@
+"""Generate synthetic Sphinx/Breathe `*_api.xml` files for benchmarking.
+
+The generated documents mirror the structure that `CodeFile` expects for each
+domain, and their size is controlled by the number of classes (or structs),
+methods (or functions) per class, parameters per method and enums.
+"""
+
+from lxml import etree
+from lxml.builder import E
+
+DOMAINS = ("py", "c", "cpp")
+
+SECTION_NAMES = {
+    "py": "python\\ api\\ documentation",
+    "c": "c\\ api\\ documentation",
+    "cpp": "c++\\ api\\ documentation",
+}
+
+ENUMERATOR_COUNT = 4
+
+
+def generate(domain, classes=10, methods=10, params=3, enums=5):
+    """Return the `document` element for a synthetic `{domain}_api.xml` file."""
+    if domain == "py":
+        contents = _python_contents(classes, methods, params)
+    elif domain == "c":
+        contents = _c_contents(classes, methods, params, enums)
+    elif domain == "cpp":
+        contents = _cpp_contents(classes, methods, params, enums)
+    else:
+        raise ValueError(f"Unknown domain: {domain}")
+
+    title = {"py": "Python", "c": "C", "cpp": "C++"}[domain]
+    section = E.section(
+        E.title(f"{title} API Documentation"),
+        E.paragraph(f"The {title} API for the benchmark\n library, which does things."),
+        E.paragraph("Second intro paragraph with ", E.strong("bold"), " text."),
+        *contents,
+        ids=f"{domain}-api-documentation",
+        names=SECTION_NAMES[domain],
+    )
+
+    return E.document(section, source=f"/docs/{domain}_api.rst")
+
+
+def write(path, domain, **sizes):
+    document = generate(domain, **sizes)
+    etree.ElementTree(document).write(str(path), encoding="utf-8", xml_declaration=True)
+
+
+def _python_contents(classes, methods, params):
+    contents = []
+
+    for c in range(classes):
+        name = f"Widget{c}"
+        members = [E.paragraph(f"A widget that frobs \"things\" and 'stuff' {c}.")]
+
+        for m in range(methods):
+            members.append(_python_method(name, f"frob{m}", params))
+
+        members.append(_python_attribute(name, "__dict__", None))
+        members.append(
+            _python_attribute(
+                name,
+                "size",
+                E.paragraph("The size of the ", E.title_reference(name)),
+            )
+        )
+
+        contents.append(
+            E.index(entries=f"['single', '{name} (class in widgets)', '', '', None]")
+        )
+        contents.append(
+            E.desc(
+                E.desc_signature(
+                    _preserve(E.desc_annotation("class ")),
+                    _preserve(E.desc_addname("widgets.")),
+                    _preserve(E.desc_name(name)),
+                    fullname=name,
+                    ids=f"widgets.{name}",
+                    module="widgets",
+                ),
+                E.desc_content(*members),
+                classes="py class",
+                desctype="class",
+                domain="py",
+                objtype="class",
+            )
+        )
+
+    return contents
+
+
+def _python_method(class_name, name, params):
+    sig_params = []
+    param_items = []
+
+    for p in range(params):
+        param = _preserve(E.desc_parameter(E.desc_sig_name(f"arg{p}")))
+        if p == params - 1:
+            param.append(E.desc_sig_operator("="))
+            param.append(E.inline("'fast'", classes="default_value"))
+        sig_params.append(param)
+
+        param_items.append(
+            E.list_item(
+                E.paragraph(
+                    E.literal_strong(f"arg{p}"),
+                    " (",
+                    E.literal_emphasis("int"),
+                    f") – Argument number {p}.",
+                )
+            )
+        )
+
+    fields = []
+    if param_items:
+        fields.append(
+            E.field(
+                E.field_name("Parameters"),
+                E.field_body(E.bullet_list(*param_items)),
+            )
+        )
+    fields.extend(
+        [
+            E.field(E.field_name("Returns"), E.field_body(E.paragraph("The result."))),
+            E.field(
+                E.field_name("Return type"),
+                E.field_body(E.paragraph(E.literal_emphasis("int"))),
+            ),
+            E.field(
+                E.field_name("Raises"),
+                E.field_body(
+                    E.paragraph(E.literal_strong("ValueError"), " – If it is bad.")
+                ),
+            ),
+        ]
+    )
+
+    return E.desc(
+        E.desc_signature(
+            _preserve(E.desc_name(name)),
+            _preserve(E.desc_parameterlist(*sig_params)),
+            fullname=f"{class_name}.{name}",
+            ids=f"widgets.{class_name}.{name}",
+            module="widgets",
+            **{"class": class_name},
+        ),
+        E.desc_content(
+            E.paragraph(f"Frob the widget *{name}* times"),
+            E.field_list(*fields),
+        ),
+        classes="py method",
+        desctype="method",
+        domain="py",
+        objtype="method",
+    )
+
+
+def _python_attribute(class_name, name, description):
+    content = E.desc_content()
+    if description is not None:
+        content.append(description)
+
+    return E.desc(
+        E.desc_signature(
+            _preserve(E.desc_name(name)),
+            fullname=f"{class_name}.{name}",
+            ids=f"widgets.{class_name}.{name}",
+            module="widgets",
+            **{"class": class_name},
+        ),
+        content,
+        classes="py attribute",
+        desctype="attribute",
+        domain="py",
+        objtype="attribute",
+    )
+
+
+def _c_contents(structs, functions, params, enums):
+    defines = [
+        _c_desc(
+            "macro",
+            f"WIDGET_MAX_{s}",
+            [E.desc_name(f"WIDGET_MAX_{s}")],
+            [E.paragraph("Max widgets.")],
+        )
+        for s in range(structs)
+    ]
+    typedefs = [
+        _c_desc(
+            "type",
+            f"widget_ctx{s}",
+            [
+                E.desc_annotation("typedef"),
+                " ",
+                E.reference(f"widget_ctx{s}_s", internal="True"),
+                " *",
+                E.desc_name(f"widget_ctx{s}"),
+            ],
+            [E.paragraph("Context handle.")],
+            domain="cpp",
+        )
+        for s in range(structs)
+    ]
+
+    contents = [
+        _container("define", "Defines", defines),
+        _container("typedef", "Typedefs", typedefs),
+        _container("enum", "Enums", [_c_enum("c", e) for e in range(enums)]),
+    ]
+
+    for s in range(structs):
+        contents.append(_c_struct("c", f"widget_point{s}"))
+
+    for s in range(structs):
+        funcs = [
+            _c_function("c", f"widget_open{s}_{f}", params) for f in range(functions)
+        ]
+        contents.append(_container("user-defined", f"Lifecycle {s}", funcs))
+
+    return contents
+
+
+def _cpp_contents(classes, methods, params, enums):
+    typedefs = [
+        _c_desc(
+            "type",
+            f"handle{c}_t",
+            [
+                E.desc_annotation("typedef"),
+                " uint32_t ",
+                E.desc_name(f"handle{c}_t"),
+            ],
+            [E.paragraph("A handle.")],
+            domain="cpp",
+        )
+        for c in range(max(classes, 1))
+    ]
+
+    members = [_container("typedef", "Typedefs", typedefs)]
+    members.extend(_c_enum("cpp", e) for e in range(enums))
+
+    for c in range(classes):
+        members.append(_c_struct("cpp", f"Point{c}"))
+
+    for c in range(classes):
+        funcs = [_c_function("cpp", f"frob{m}", params) for m in range(methods)]
+        members.append(
+            _c_desc(
+                "class",
+                f"Widget{c}",
+                [E.desc_annotation("class "), E.desc_name(f"Widget{c}")],
+                [
+                    E.emphasis("#include <widget.h>"),
+                    E.paragraph("The widget class."),
+                    _container("public-func", "Public Functions", funcs),
+                ],
+                domain="cpp",
+            )
+        )
+
+    namespace = _c_desc(
+        "type",
+        "widgets",
+        ["namespace ", E.desc_name("widgets")],
+        members,
+        domain="cpp",
+        target="namespacewidgets",
+    )
+
+    return [namespace]
+
+
+def _c_desc(objtype, name, signature, content, domain="c", target=None):
+    if target is None:
+        target = f"{objtype}_{name}".lower()
+
+    signature_line = E.desc_signature_line(E.target(ids=target), add_permalink="True")
+    for part in signature:
+        if isinstance(part, str):
+            if len(signature_line):
+                last = signature_line[-1]
+                last.tail = (last.tail or "") + part
+            else:
+                signature_line.text = (signature_line.text or "") + part
+        else:
+            signature_line.append(part)
+
+    return E.desc(
+        E.desc_signature(signature_line, ids=f"{domain}.{name}", is_multiline="True"),
+        E.desc_content(*content),
+        classes=f"{domain} {objtype}",
+        desctype=objtype,
+        domain=domain,
+        objtype=objtype,
+    )
+
+
+def _c_enum(domain, index):
+    name = f"widget_mode{index}"
+    enumerators = [
+        _c_desc(
+            "enumerator",
+            f"MODE_{index}_{e}",
+            [E.desc_name(f"MODE_{index}_{e}")],
+            [E.paragraph(f"Mode {e}.")] if e % 2 else [],
+            domain=domain,
+        )
+        for e in range(ENUMERATOR_COUNT)
+    ]
+
+    return _c_desc(
+        "enum",
+        name,
+        [E.desc_annotation("enum "), E.desc_name(name)],
+        [E.paragraph("Operating mode."), E.paragraph("Values:"), *enumerators],
+        domain=domain,
+    )
+
+
+def _c_struct(domain, name):
+    fields = [
+        _c_desc(
+            "var",
+            f"{name}.{field}",
+            ["int ", E.desc_name(field)],
+            [E.paragraph(f"{field.upper()} coordinate.")],
+            domain=domain,
+        )
+        for field in ("x", "y")
+    ]
+
+    return _c_desc(
+        "struct",
+        name,
+        [E.desc_annotation("struct "), E.desc_name(name)],
+        [
+            E.paragraph("A point."),
+            _container("public-attrib", "Public Members", fields),
+        ],
+        domain=domain,
+    )
+
+
+def _c_function(domain, name, params):
+    sig_params = E.desc_parameterlist()
+    param_items = []
+
+    for p in range(params):
+        if p == 0 and domain == "c":
+            param = E.desc_parameter(
+                E.reference("widget_ctx", internal="True", reftitle="widget_ctx"),
+                E.emphasis(f"arg{p}"),
+                noemph="True",
+            )
+            param[0].tail = " *"
+        else:
+            param = E.desc_parameter("int ", E.emphasis(f"arg{p}"), noemph="True")
+        sig_params.append(param)
+
+        param_items.append(
+            E.list_item(E.paragraph(E.literal(f"arg{p}"), f": Argument number {p}."))
+        )
+
+    definitions = []
+    if param_items:
+        definitions.append(
+            E.definition_list_item(
+                E.term("Parameters"), E.definition(E.bullet_list(*param_items))
+            )
+        )
+    if domain == "cpp":
+        definitions.append(
+            E.definition_list_item(
+                E.term("Exceptions"),
+                E.definition(
+                    E.bullet_list(
+                        E.list_item(
+                            E.paragraph(
+                                E.literal("std::runtime_error"), ": On failure."
+                            )
+                        )
+                    )
+                ),
+            )
+        )
+    definitions.append(
+        E.definition_list_item(
+            E.term("Return"), E.definition(E.paragraph("0 on success."))
+        )
+    )
+
+    return _c_desc(
+        "function",
+        name,
+        ["int ", E.desc_name(name), sig_params],
+        [E.paragraph(f"Call {name}."), E.definition_list(*definitions)],
+        domain=domain,
+    )
+
+
+def _container(objtype, title, members):
+    return E.container(
+        E.rubric(title, classes="breathe-sectiondef-title"),
+        *members,
+        classes="breathe-sectiondef",
+        objtype=objtype,
+    )
+
+
+def _preserve(elem):
+    elem.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
+    return elem
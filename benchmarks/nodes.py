@@ -0,0 +1,172 @@
+"""Measure the cost of building the render tree out of `Node` objects.
+
+Builds a tree shaped like the output of `Renderer` (a section holding many
+method blocks, each with a heading, a parameter list and a description), then
+reports the time and memory it took per node, and the time taken to convert
+the tree to lxml elements with `raw()`. Run it against two revisions to
+compare them. Revisions where nodes still take a `DocTree` are supported too:
+
+    PYTHONPATH=. python benchmarks/nodes.py --count 200000
+    PYTHONPATH=../old python benchmarks/nodes.py --count 200000
+"""
+
+import os, sys
+import argparse
+import gc
+import json
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from hugoify.parser_utils import Node
+
+try:
+    from hugoify.parser_utils import RenderContext
+except ImportError:
+    # Older revisions pass a `DocTree` to every node as keyword arguments.
+    from hugoify.parser_utils import DocTree
+
+    RenderContext = None
+
+# The number of nodes created by `build_method`.
+NODES_PER_METHOD = 10
+
+
+@contextmanager
+def root_context(tag):
+    if RenderContext is None:
+        with DocTree(tag, opening_newline=True) as context:
+            yield context
+    else:
+        yield RenderContext(tag)
+
+
+@contextmanager
+def child_context(context, tag):
+    if RenderContext is None:
+        with DocTree(tag, **context) as child:
+            yield child
+    else:
+        yield context.enter(tag)
+
+
+def new_node(tag, context):
+    if RenderContext is None:
+        return Node(tag, **context)
+
+    return Node(tag, context=context)
+
+
+def build_method(parent, context, index):
+    with child_context(context, "div") as d:
+        method = new_node("div", d)
+        method.set("class", "method")
+
+        with child_context(d, "h") as d_h:
+            heading = new_node("h", d_h)
+            heading.set("class", "signature include-toc")
+
+            name = Node("span")
+            name.set("class", "name")
+            name.add_text(f"method{index}")
+            heading.append(name)
+
+            params = new_node("span", d_h)
+            params.set("class", "param-list")
+            params.text += "("
+            for p in range(3):
+                param = new_node("span", d_h)
+                param.set("class", "param")
+                param.add_text(f"arg{p}")
+                param.tail = ", "
+                params.append(param)
+            heading.append(params)
+
+            method.append(heading)
+
+        body = new_node("div", d)
+        body.set("class", "body")
+        paragraph = new_node("p", d)
+        paragraph.add_text(f"Frob the widget {index} times.")
+        paragraph.tail = " "
+        body.append(paragraph)
+
+        strong = new_node("strong", d)
+        strong.add_text("Note")
+        body.append(strong)
+
+        method.append(body)
+
+    parent.append(method)
+
+
+def build_tree(methods):
+    with root_context("div") as d:
+        root = new_node("div", d)
+        root.set("class", "api-docs")
+
+        for index in range(methods):
+            build_method(root, d, index)
+
+    return root
+
+
+def current_rss_kb():
+    try:
+        with open("/proc/self/statm") as fp:
+            pages = int(fp.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000, help="Number of nodes.")
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    args = parser.parse_args()
+
+    methods = max(args.count // NODES_PER_METHOD, 1)
+    nodes = methods * NODES_PER_METHOD + 1
+
+    gc.collect()
+    rss_before = current_rss_kb()
+    start = time.perf_counter()
+    tree = build_tree(methods)
+    build_seconds = time.perf_counter() - start
+    rss_after = current_rss_kb()
+
+    start = time.perf_counter()
+    tree.raw()
+    raw_seconds = time.perf_counter() - start
+
+    del tree
+    gc.collect()
+
+    # Trace memory in a separate build, since tracing slows it down.
+    tracemalloc.start()
+    tree = build_tree(methods)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        "nodes": nodes,
+        "build_ns_per_node": round(build_seconds / nodes * 1e9),
+        "raw_ns_per_node": round(raw_seconds / nodes * 1e9),
+        "tracemalloc_bytes_per_node": round(traced / nodes),
+        "rss_bytes_per_node": round((rss_after - rss_before) * 1024 / nodes),
+    }
+
+    for key, val in result.items():
+        print(f"{key:<28} {val}")
+
+    if args.json:
+        with args.json.open("w") as fp:
+            json.dump(result, fp, indent=2)
+            fp.write("\n")
+
+
+if __name__ == "__main__":
+    main()
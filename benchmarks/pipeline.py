@@ -0,0 +1,232 @@
+"""Time each phase of the conversion pipeline on synthetic inputs.
+
+For each domain, a synthetic `*_api.xml` file is generated (see `fixtures.py`)
+and converted the same way `hugoify.convert_file` does, timing each phase:
+
+    ingest          load_document
+    parse           CodeFile.parse
+    processed_xml   build_document, and writing the `-processed.xml` file
+    render          Renderer, excluding the final write
+    write           writing the Markdown file
+
+Every case runs in a fresh process, so the reported peak RSS belongs to that
+case alone. The results can be written to a JSON file and compared against a
+previous report:
+
+    PYTHONPATH=. python benchmarks/pipeline.py --classes 50 --json new.json
+    PYTHONPATH=. python benchmarks/pipeline.py --classes 50 --compare old.json
+"""
+
+import os, sys
+import argparse
+import json
+import platform
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from multiprocessing import get_context
+from pathlib import Path
+
+import fixtures
+
+PHASES = ("ingest", "parse", "processed_xml", "render", "write")
+
+
+class PhaseTimer:
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.seconds = {}
+        self.memory = {}
+
+    @contextmanager
+    def phase(self, name):
+        # A nested phase is still timed, but its memory is included in the
+        # phase that contains it.
+        trace_memory = self.trace_memory and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.seconds[name] = self.seconds.get(name, 0) + elapsed
+
+            if trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.memory[name] = max(self.memory.get(name, 0), peak)
+
+
+def convert(input_file, work_dir, timer):
+    # Imported here, so that the import isn't counted in the parent process.
+    import hugoify
+    from hugoify.htmlify import Renderer
+    from hugoify.ingest import load_document
+    from lxml import etree
+
+    write = Renderer.write
+
+    def timed_write(self, text):
+        with timer.phase("write"):
+            write(self, text)
+
+    with timer.phase("ingest"):
+        root = load_document(input_file)
+
+    with timer.phase("parse"):
+        contents = hugoify.CodeFile(root.find("section"))
+        contents.parse()
+
+    with timer.phase("processed_xml"):
+        doc = hugoify.build_document(contents)
+        output_xml = work_dir / f"{input_file.stem}-processed.xml"
+        with output_xml.open("w") as fp:
+            fp.write(etree.tostring(doc, encoding="unicode"))
+            fp.write("\n")
+
+    Renderer.write = timed_write
+    try:
+        with timer.phase("render"):
+            Renderer(input_file, work_dir, document=doc)
+    finally:
+        Renderer.write = write
+
+    # The write phase is nested inside the render phase.
+    timer.seconds["render"] -= timer.seconds["write"]
+
+
+def run_case(domain, sizes, repeat=1, trace_memory=False):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = Path(tmp_dir)
+        input_file = work_dir / f"{domain}_api.xml"
+        fixtures.write(input_file, domain, **sizes)
+
+        runs = []
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for _ in range(repeat):
+                timer = PhaseTimer(trace_memory)
+                convert(input_file, work_dir, timer)
+                runs.append(timer)
+
+        input_bytes = input_file.stat().st_size
+
+    phases = {}
+    for name in PHASES:
+        seconds = [_.seconds.get(name, 0) for _ in runs]
+        phases[name] = {
+            "median": round(statistics.median(seconds), 6),
+            "min": round(min(seconds), 6),
+        }
+        if trace_memory:
+            phases[name]["tracemalloc_peak_bytes"] = max(
+                _.memory.get(name, 0) for _ in runs
+            )
+
+    # `ru_maxrss` is in kilobytes on Linux, but in bytes on macOS.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+
+    return {
+        "domain": domain,
+        "sizes": sizes,
+        "input_bytes": input_bytes,
+        "repeat": repeat,
+        "phases": phases,
+        "total_median": round(sum(_["median"] for _ in phases.values()), 6),
+        "peak_rss_kb": peak_rss,
+    }
+
+
+def compare(results, baseline):
+    previous = {
+        (_["domain"], json.dumps(_["sizes"], sort_keys=True)): _
+        for _ in baseline["cases"]
+    }
+
+    for result in results:
+        key = (result["domain"], json.dumps(result["sizes"], sort_keys=True))
+        if (old := previous.get(key)) is None:
+            print(f"{result['domain']}: no matching case in the baseline")
+            continue
+
+        print(f"{result['domain']}:")
+        for name in PHASES:
+            new_time = result["phases"][name]["median"]
+            old_time = old["phases"][name]["median"]
+            ratio = new_time / old_time if old_time else float("inf")
+            print(
+                f"  {name:<14} {old_time:>10.4f}s -> {new_time:>10.4f}s  x{ratio:.2f}"
+            )
+
+
+def print_results(results):
+    header = f"{'domain':<6} {'input':>10}" + "".join(f" {_:>14}" for _ in PHASES)
+    print(header + f" {'total':>10} {'peak RSS':>12}")
+
+    for result in results:
+        line = f"{result['domain']:<6} {result['input_bytes']:>10}"
+        for name in PHASES:
+            line += f" {result['phases'][name]['median']:>13.4f}s"
+        line += f" {result['total_median']:>9.4f}s {result['peak_rss_kb']:>9} kB"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--domains", nargs="+", choices=fixtures.DOMAINS)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--methods", type=int, default=10)
+    parser.add_argument("--params", type=int, default=3)
+    parser.add_argument("--enums", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Record the peak Python memory of each phase (slows every phase down).",
+    )
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    parser.add_argument("--compare", type=Path, help="A previous JSON report.")
+    args = parser.parse_args()
+
+    sizes = {
+        "classes": args.classes,
+        "methods": args.methods,
+        "params": args.params,
+        "enums": args.enums,
+    }
+
+    results = []
+    for domain in args.domains or fixtures.DOMAINS:
+        # Use a fresh interpreter for every case, so peak memory isn't shared.
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            future = executor.submit(
+                run_case, domain, sizes, args.repeat, args.tracemalloc
+            )
+            results.append(future.result())
+
+    print_results(results)
+
+    if args.compare:
+        with args.compare.open() as fp:
+            compare(results, json.load(fp))
+
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cases": results,
+        }
+        with args.json.open("w") as fp:
+            json.dump(report, fp, indent=2)
+            fp.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Measure the peak memory used by `Renderer` on processed documents.
+
+Each `*-processed.xml` file is loaded and rendered in a fresh process, and the
+resident memory is reported after loading the document and at its peak while
+rendering, so that the difference is the cost of rendering alone. A large
+input can be generated from the synthetic fixtures:
+
+    PYTHONPATH=. python benchmarks/render_memory.py --generate cpp --classes 400
+    PYTHONPATH=. python benchmarks/render_memory.py content/GENERATED/*-processed.xml
+"""
+
+import os, sys
+import argparse
+import json
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from multiprocessing import get_context
+from pathlib import Path
+
+import fixtures
+
+
+def current_rss_kb():
+    with open("/proc/self/statm") as fp:
+        pages = int(fp.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def peak_rss_kb():
+    # `ru_maxrss` is in kilobytes on Linux, but in bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024
+    return peak
+
+
+def generate_processed(domain, output_dir, **sizes):
+    import hugoify
+    from hugoify.ingest import load_document
+    from lxml import etree
+
+    input_file = output_dir / f"{domain}_api.xml"
+    fixtures.write(input_file, domain, **sizes)
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        contents = hugoify.CodeFile(load_document(input_file).find("section"))
+        contents.parse()
+        doc = hugoify.build_document(contents)
+
+    processed = output_dir / f"{domain}_api-processed.xml"
+    with processed.open("w") as fp:
+        fp.write(etree.tostring(doc, encoding="unicode"))
+        fp.write("\n")
+
+    return processed
+
+
+def measure(processed):
+    from hugoify.htmlify import Renderer
+    from lxml import etree
+
+    document = etree.parse(str(processed)).getroot()
+    loaded_rss = current_rss_kb()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            Renderer(processed, Path(tmp_dir), document=document)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "file": str(processed),
+        "input_bytes": processed.stat().st_size,
+        "loaded_rss_kb": loaded_rss,
+        "peak_rss_kb": peak_rss_kb(),
+        "render_rss_kb": peak_rss_kb() - loaded_rss,
+        "seconds": round(elapsed, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="*", type=Path)
+    parser.add_argument("--generate", choices=fixtures.DOMAINS, action="append")
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--methods", type=int, default=20)
+    parser.add_argument("--params", type=int, default=4)
+    parser.add_argument("--enums", type=int, default=20)
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    args = parser.parse_args()
+
+    sizes = {
+        "classes": args.classes,
+        "methods": args.methods,
+        "params": args.params,
+        "enums": args.enums,
+    }
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        inputs = [_.resolve() for _ in args.inputs]
+        for domain in args.generate or []:
+            inputs.append(generate_processed(domain, Path(tmp_dir), **sizes))
+
+        for processed in inputs:
+            # Use a fresh interpreter for every input, so peak memory isn't shared.
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+                results.append(executor.submit(measure, processed).result())
+
+    for result in results:
+        print(
+            "{file}: {input_bytes} bytes, loaded={loaded_rss_kb} kB "
+            "peak={peak_rss_kb} kB render={render_rss_kb} kB "
+            "time={seconds}s".format(**result)
+        )
+
+    if args.json:
+        with args.json.open("w") as fp:
+            json.dump(results, fp, indent=2)
+            fp.write("\n")
+
+
+if __name__ == "__main__":
+    main()
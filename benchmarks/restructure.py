@@ -0,0 +1,133 @@
+"""Measure the cost of the `CodeFile` restructuring passes.
+
+For every input file, this parses the generated XML, runs `CodeFile.parse` and
+reports a digest of the processed tree, along with the number of `deepcopy`
+calls made by `hugoify`, the number of elements they copied and the peak
+Python memory used. Because only the digest of the output is reported, the
+results of two revisions can be compared directly:
+
+    PYTHONPATH=. python benchmarks/restructure.py content/GENERATED/*_api.xml
+    PYTHONPATH=../old python benchmarks/restructure.py content/GENERATED/*_api.xml
+
+Use `--scale` to repeat every top-level object of the inputs, which turns a
+small file into a large fixture.
+"""
+
+import os, sys
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+from hashlib import sha256
+from pathlib import Path
+
+from lxml import etree
+
+import hugoify
+
+REMOVE_ATTRS = ["noemph", "{*}space", "add_permalink", "is_multiline", "noindex"]
+
+
+class CountingDeepcopy:
+    def __init__(self):
+        self.calls = 0
+        self.elements = 0
+
+    def __call__(self, obj, memo=None):
+        self.calls += 1
+        if isinstance(obj, etree._Element):
+            self.elements += sum(1 for _ in obj.iter())
+        elif isinstance(obj, list):
+            for item in obj:
+                if isinstance(item, etree._Element):
+                    self.elements += sum(1 for _ in item.iter())
+
+        return deepcopy(obj, memo)
+
+
+def load(path, scale=1):
+    tree = etree.parse(
+        str(path), parser=etree.XMLParser(recover=True, remove_comments=True)
+    )
+    root = tree.getroot()
+    etree.strip_attributes(root, *REMOVE_ATTRS)
+
+    body = root.find("section")
+    if scale > 1:
+        for elem in body.xpath("./desc | ./container"):
+            for _ in range(scale - 1):
+                elem.addnext(deepcopy(elem))
+
+    return body
+
+
+def measure(path, scale=1):
+    body = load(path, scale)
+    element_count = sum(1 for _ in body.iter())
+
+    counter = CountingDeepcopy()
+    hugoify.deepcopy = counter
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        contents = hugoify.CodeFile(body)
+        contents.parse()
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        hugoify.deepcopy = deepcopy
+
+    processed = etree.tostring(contents.root, encoding="utf-8")
+
+    return {
+        "file": str(path),
+        "scale": scale,
+        "input_elements": element_count,
+        "processed_sha256": sha256(processed).hexdigest(),
+        "deepcopy_calls": counter.calls,
+        "deepcopy_elements": counter.elements,
+        "tracemalloc_peak_bytes": peak,
+        "seconds": round(elapsed, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", type=Path)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    args = parser.parse_args()
+
+    inputs = [_.resolve() for _ in args.inputs]
+
+    # Older revisions of `CodeFile` write debugging output to the working
+    # directory, so keep that out of the way.
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            for path in inputs:
+                results.append(measure(path, args.scale))
+        finally:
+            os.chdir(cwd)
+
+    for result in results:
+        print(
+            "{file}: {processed_sha256:.12} "
+            "deepcopy={deepcopy_calls} ({deepcopy_elements} elements) "
+            "peak={tracemalloc_peak_bytes} time={seconds}s".format(**result)
+        )
+
+    if args.json:
+        with args.json.open("w") as fp:
+            json.dump(results, fp, indent=2)
+            fp.write("\n")
+
+
+if __name__ == "__main__":
+    main()
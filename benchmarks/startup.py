@@ -0,0 +1,155 @@
+"""Measure how long importing `hugoify` takes in a fresh interpreter.
+
+Each run imports the package in a new process, along with a baseline module
+that it can't do without (`lxml.etree`, which most of the import time is spent
+on). The median time that the package adds on top of the baseline is compared
+against a budget, so that heavy or debug-only modules don't creep back into
+the startup path. The script exits with a non-zero status when the budget is
+exceeded, and `tests/test_startup.py` runs it when `HUGOIFY_STARTUP_BUDGET`
+is set. The bytecode is written to a temporary `PYTHONPYCACHEPREFIX` by a
+first, untimed import, so nothing is written next to the sources:
+
+    PYTHONPATH=. python benchmarks/startup.py --budget 50
+    PYTHONPATH=. python benchmarks/startup.py --runs 20 --json startup.json
+"""
+
+import os, sys
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+# The default budget for the time that importing `hugoify` adds to importing
+# the baseline module, in milliseconds.
+DEFAULT_BUDGET_MS = 50.0
+
+DEFAULT_BASELINE = "lxml.etree"
+
+IMPORT_CODE = """\
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def import_times(module, prefix):
+    """Import `module` in a fresh process, returning how long it took.
+
+    The bytecode of the imported modules is cached in the `prefix` directory.
+
+    Returns the time in milliseconds, and a dictionary that maps the name of
+    every module that was imported to its cumulative import time, in
+    microseconds, as reported by `python -X importtime`.
+    """
+    # The bytecode is written even if PYTHONDONTWRITEBYTECODE is set, since it
+    # only goes to the temporary `prefix`.
+    env = {**os.environ, "PYTHONPYCACHEPREFIX": prefix}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_CODE.format(module=module)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+
+        times[name.strip()] = int(cumulative_us)
+
+    return float(proc.stdout) * 1000, times
+
+
+def measure(module, baseline, runs):
+    with tempfile.TemporaryDirectory() as prefix:
+        # Compiling the bytecode isn't counted.
+        import_times(module, prefix)
+        import_times(baseline, prefix)
+
+        # The runs are interleaved, so both are affected by the same noise.
+        totals = []
+        baselines = []
+        samples = []
+        for _ in range(runs):
+            total, times = import_times(module, prefix)
+            totals.append(total)
+            samples.append(times)
+            baselines.append(import_times(baseline, prefix)[0])
+
+    slowest = {}
+    for name in samples[0]:
+        if name == module:
+            continue
+        slowest[name] = statistics.median(_.get(name, 0) for _ in samples)
+
+    return {
+        "module": module,
+        "baseline": baseline,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals), 2),
+        "baseline_ms": round(statistics.median(baselines), 2),
+        "overhead_ms": round(
+            statistics.median(totals) - statistics.median(baselines), 2
+        ),
+        "slowest": {
+            name: round(us / 1000, 2)
+            for name, us in sorted(slowest.items(), key=lambda _: -_[1])[:10]
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="hugoify", help="The module to import.")
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="A module the import time is measured against.",
+    )
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Fail if importing the module takes this many milliseconds longer "
+        "than importing the baseline (median of all runs).",
+    )
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    args = parser.parse_args()
+
+    result = measure(args.module, args.baseline, args.runs)
+    result["budget_ms"] = args.budget
+
+    print(
+        f"{result['module']}: {result['median_ms']:.1f} ms median, of which"
+        f" {result['overhead_ms']:.1f} ms is on top of {result['baseline']}"
+        f" ({result['baseline_ms']:.1f} ms) over {result['runs']} runs,"
+        f" budget {args.budget:.1f} ms"
+    )
+    print("Slowest imports (cumulative):")
+    for name, ms in result["slowest"].items():
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if args.json:
+        with args.json.open("w") as fp:
+            json.dump(result, fp, indent=2)
+            fp.write("\n")
+
+    if result["overhead_ms"] > args.budget:
+        print(f"Import time exceeds the budget of {args.budget:.1f} ms.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,147 @@
 # from .markdownify import main
 import os, sys
-from copy import deepcopy
-from datetime import datetime
+import time
+from functools import partial
 from pathlib import Path
 from lxml import etree
 from lxml.builder import E
 
-from .utils import generate_frontmatter
-from .utils import partial_dump, ugly_dump, ugly_dump_if_contains
-
-from pprint import pprint
+from .utils import get_flag
 
 # from .xslt import xslt
-from .htmlify import htmlify
-
+from .htmlify import Renderer, get_rendered_path
+from .jobs import JobResult, get_job_count, run_jobs
+from .jobs import report_results, report_failures
+from .cache import BuildManifest, hash_file, get_lastmod, write_if_changed
+from .ingest import load_document
+from .xpaths import xpath, reset_hits, format_report
+from .visitor import TreeVisitor
+from .watch import FileWatcher, watch, DEFAULT_INTERVAL
+from .instrument import timed, traced, phase, span
+from .instrument import profile_file, format_summary, write_trace
+from .report import FileReport, write_report
+from .report import deepcopy, reset_deepcopies, get_deepcopies
+from .render_cache import RenderCache, DEFAULT_MAX_BYTES
+from .shard import parse_shard, select_shard, merge_shards
+
+
+def parse_args(argv=None):
+    import argparse
+
+    def shard(value):
+        try:
+            return parse_shard(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv and (sources := os.getenv("INPUT_MERGE", "").split()):
+        argv = ["merge", *sources]
+
+    parser = argparse.ArgumentParser(
+        prog="hugoify",
+        description="Convert generated API docs into Markdown for Hugo.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, and re-render each input file when it changes.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="How often to check for changes in watch mode, in seconds.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=get_flag("INPUT_PROFILE"),
+        help="Record the time and net memory change of each phase of every file.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=os.getenv("INPUT_PROFILEDIR") or None,
+        help="Also save a cProfile `.prof` file for every file to this directory.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=os.getenv("INPUT_TRACE") or None,
+        help="Write a Chrome trace of every file, phase and API object to this file.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=os.getenv("INPUT_REPORT") or None,
+        help="Write a JSON report with counters for every converted file to this file.",
+    )
+    parser.add_argument(
+        "--render-cache",
+        type=Path,
+        default=os.getenv("INPUT_RENDERCACHE") or None,
+        help="Reuse the output of unchanged API objects from a cache in this directory.",
+    )
+    parser.add_argument(
+        "--render-cache-size",
+        type=float,
+        default=os.getenv("INPUT_RENDERCACHESIZE") or DEFAULT_MAX_BYTES / (1 << 20),
+        help="The size limit of the render cache, in MiB.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=shard,
+        metavar="INDEX/COUNT",
+        default=os.getenv("INPUT_SHARD") or None,
+        help="Only convert this shard of the input files, e.g. `2/4`.",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="Combine the output directories and run reports of sharded runs.",
+    )
+    merge_parser.add_argument(
+        "sources",
+        nargs="+",
+        type=Path,
+        help="The output directories and JSON run reports of the shards.",
+    )
+    merge_parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path(os.getenv("INPUT_OUTPUTPATH", "content/api/")),
+        help="The directory to merge the output of the shards into.",
+    )
+    merge_parser.add_argument(
+        "--report",
+        type=Path,
+        default=argparse.SUPPRESS,
+        help="Write the merged run report to this file.",
+    )
+
+    args = parser.parse_args(argv)
+    if args.watch and args.shard is not None:
+        parser.error("--shard can't be used with --watch")
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == "merge":
+        if not merge_shards(args.sources, args.output_dir, args.report):
+            sys.exit(1)
+        sys.exit(0)
 
-def main():
     input_dir = Path(os.getenv("INPUT_RAWPATH", "content/GENERATED/"))
     output_dir = Path(os.getenv("INPUT_OUTPUTPATH", "content/api/"))
+    jobs = get_job_count(os.getenv("INPUT_JOBS"))
+    debug = get_flag("INPUT_DEBUG")
+    force = get_flag("INPUT_FORCE")
 
     if not input_dir.exists():
         print("Exiting because there are no files to process...")
@@ -26,62 +150,275 @@ def main():
 
     print(f"Processing content of {input_dir.resolve()}...")
     print(f"Outputting results to {output_dir.resolve()}...")
+    if jobs > 1:
+        print(f"Using {jobs} worker processes...")
+
+    # The inputs are snapshotted before the initial build, so that files that
+    # change while it runs are picked up by watch mode.
+    watcher = FileWatcher(input_dir) if args.watch else None
+
+    input_files = sorted(input_dir.glob("*_api.xml"))
+
+    manifest = BuildManifest(output_dir)
+    remove_outputs(output_dir, manifest.prune(input_files), manifest)
+
+    # A shard only keeps the entries of the files that it owns, so that merging
+    # never picks up output left over from a build of other inputs.
+    if args.shard is not None:
+        index, count = args.shard
+        input_files = select_shard(input_files, args.shard)
+        print(f"Converting {len(input_files)} file(s) in shard {index}/{count}...")
+
+        manifest.prune(input_files)
+
+    convert = partial(
+        render_files,
+        input_dir=input_dir,
+        output_dir=output_dir,
+        manifest=manifest,
+        keep_processed=debug,
+        profile=args.profile or args.profile_dir is not None,
+        profile_dir=args.profile_dir,
+        trace=args.trace is not None,
+        count_elements=args.report is not None,
+        render_cache_dir=args.render_cache,
+    )
+
+    trace_events = []
+
+    # In watch mode, a rebuild only converts the files that changed, so the
+    # report keeps the entries of the other files from earlier builds.
+    file_reports = {}
+    failed_files = {}
+
+    def record(results):
+        reports = [_.value for _ in results if not _.failed]
+
+        for result in results:
+            name = Path(result.item).name
+            file_reports.pop(name, None)
+            failed_files.pop(name, None)
+
+            if result.failed:
+                failed_files[name] = result.item
+            else:
+                file_reports[name] = result.value
 
-    for f in input_dir.glob("*_api.xml"):
-        print(f"Processing {str(f)}...")
+        if args.render_cache is not None:
+            max_bytes = int(args.render_cache_size * (1 << 20))
+            if evicted := RenderCache(args.render_cache, max_bytes).evict():
+                print(f"Evicted {evicted} fragment(s) from the render cache...")
 
-        tree = etree.parse(
-            str(f), parser=etree.XMLParser(recover=True, remove_comments=True)
-        )
-        root = tree.getroot()
-
-        remove_attrs = [
-            "noemph",
-            "{*}space",
-            "add_permalink",
-            "is_multiline",
-            "noindex",
-        ]
-        etree.strip_attributes(
-            root,
-            *remove_attrs,
+        if args.trace is not None:
+            for report in reports:
+                trace_events.extend(report.profile.events)
+
+            write_trace(args.trace, trace_events)
+            print(f"Saved the trace to {args.trace}")
+
+        if args.report is not None:
+            write_report(args.report, file_reports.values(), failed_files.values())
+            print(f"Saved the run report to {args.report}")
+
+    results = convert(input_files, jobs=jobs, force=force)
+    record(results)
+    failures = report_failures(results)
+
+    if args.watch:
+
+        def update(changed, removed):
+            pruned = manifest.prune(sorted(input_dir.glob("*_api.xml")))
+            remove_outputs(output_dir, pruned, manifest)
+            for f in removed:
+                file_reports.pop(f.name, None)
+                failed_files.pop(f.name, None)
+
+            results = convert(changed)
+            record(results)
+            report_failures(results)
+
+        watch(update, input_dir, interval=args.interval, watcher=watcher)
+        sys.exit(0)
+
+    if failures:
+        sys.exit(1)
+
+    sys.exit(0)
+
+
+def render_files(
+    input_files, input_dir, output_dir, manifest, jobs=1, force=False, **kwargs
+):
+    """Convert the input files that changed since the manifest was last saved.
+
+    If `force` is true, every file is converted, even if it hasn't changed.
+    Files that can't be read (e.g. because they were deleted since they were
+    found) fail without stopping the others.
+    """
+    digests = {}
+    lastmods = {}
+    pending_files = []
+    unreadable = []
+    for f in input_files:
+        try:
+            digests[f] = hash_file(f)
+            lastmods[f] = manifest.get_lastmod(f, digests[f])
+        except OSError as e:
+            unreadable.append(JobResult(f, error=f"Couldn't read {f}: {e}\n"))
+            continue
+
+        if not force and manifest.is_current(
+            f, digests[f], get_rendered_path(f, output_dir)
+        ):
+            print(f"Skipping {str(f)} because it hasn't changed...")
+            continue
+
+        pending_files.append(f)
+
+    results = unreadable + report_results(
+        run_jobs(
+            convert_file,
+            pending_files,
+            input_dir,
+            output_dir,
+            jobs=jobs,
+            lastmods={_: lastmods[_] for _ in pending_files},
+            **kwargs,
         )
+    )
+
+    for result in results:
+        if not result.failed:
+            f = result.item
+            manifest.update(
+                f, digests[f], get_rendered_path(f, output_dir), lastmods[f]
+            )
+    manifest.save()
+
+    if results:
+        rewritten = sum(_.value.rewritten for _ in results if not _.failed)
+        print(f"Rewrote {rewritten} of {len(results)} rendered file(s)...")
+
+    if kwargs.get("profile"):
+        print(format_summary([_.value.profile for _ in results if not _.failed]))
+
+    return results
+
+
+def remove_outputs(output_dir, entries, manifest):
+    """Delete the pages rendered from the inputs of the pruned `entries`."""
+    current = {_.get("output") for _ in manifest.entries.values()}
+
+    for entry in entries.values():
+        if (output := entry.get("output")) is None or output in current:
+            continue
+
+        rendered_file = Path(output_dir) / output
+        if rendered_file.exists():
+            print(f"Removing {rendered_file} because its input was removed...")
+            rendered_file.unlink()
+
+
+def convert_file(
+    f,
+    input_dir,
+    output_dir,
+    keep_processed=False,
+    profile=False,
+    profile_dir=None,
+    trace=False,
+    count_elements=False,
+    render_cache_dir=None,
+    lastmods=None,
+):
+    """Convert `f` to Markdown, returning a `FileReport` of the conversion.
+
+    `lastmods` maps input files to the `lastmod` timestamp of their page. Files
+    without one use the modification time of the input file.
+    """
+    print(f"Processing {str(f)}...")
+    reset_hits()
+    reset_deepcopies()
+
+    file_report = FileReport(f)
+    start = time.perf_counter()
+
+    with profile_file(f, profile, profile_dir, trace) as file_profile:
+        root = load_document(f)
+        if count_elements:
+            file_report.count_elements(root)
 
         body = root.find("section")
-        contents = CodeFile(body)
+        contents = CodeFile(body, debug=keep_processed)
         contents.parse()
         # frontmatter, parsed = parse_file(f)
 
-        output_xml = input_dir / f"{f.stem}-processed.xml"
+        doc = build_document(contents)
 
-        with output_xml.open("w") as fp:
-            doc = E.document()
+        # The processed XML is only needed to debug the output of `CodeFile`,
+        # since the document is handed to the renderer directly.
+        if keep_processed:
+            output_xml = input_dir / f"{f.stem}-processed.xml"
 
-            if contents.domain == CodeFile.DOMAIN_PY:
-                doc.set("api-lang", "python")
-                doc.set("title", "Python API Documentation")
-            elif contents.domain == CodeFile.DOMAIN_CPP:
-                doc.set("api-lang", "cpp")
-                doc.set("title", "C++ API Documentation")
-            elif contents.domain == CodeFile.DOMAIN_C:
-                doc.set("api-lang", "c")
-                doc.set("title", "C API Documentation")
+            with phase("processed_xml"):
+                doc_text = etree.tostring(doc, encoding="unicode")
+                write_if_changed(output_xml, f"{doc_text}\n")
 
-            title_element = E.document_title(doc.get("title"))
-            doc.append(title_element)
+        print()
 
-            children = root.find("./section").getchildren()
-            doc.extend(children)
-            etree.indent(doc, space="    ", level=1)
-            doc_text = etree.tostring(doc, encoding="unicode")
-            fp.write(doc_text)
-            fp.write("\n")
+        render_cache = None
+        if render_cache_dir is not None:
+            render_cache = RenderCache(render_cache_dir)
 
-        print()
+        if (lastmod := (lastmods or {}).get(f)) is None:
+            lastmod = get_lastmod(f)
 
-    htmlify(input_dir, output_dir)
+        renderer = Renderer(
+            f, output_dir, document=doc, render_cache=render_cache, lastmod=lastmod
+        )
 
-    sys.exit(0)
+    file_report.seconds = time.perf_counter() - start
+    file_report.deepcopies = get_deepcopies()
+    file_report.add_renderer(renderer)
+    file_report.profile = file_profile
+
+    if keep_processed:
+        print(format_report(limit=20))
+
+    return file_report
+
+
+@timed
+def build_document(contents):
+    doc = E.document()
+
+    if contents.domain == CodeFile.DOMAIN_PY:
+        doc.set("api-lang", "python")
+        doc.set("title", "Python API Documentation")
+    elif contents.domain == CodeFile.DOMAIN_CPP:
+        doc.set("api-lang", "cpp")
+        doc.set("title", "C++ API Documentation")
+    elif contents.domain == CodeFile.DOMAIN_C:
+        doc.set("api-lang", "c")
+        doc.set("title", "C API Documentation")
+
+    title_element = E.document_title(doc.get("title"))
+    doc.append(title_element)
+
+    children = contents.root.getchildren()
+    doc.extend(children)
+    etree.indent(doc, space="    ", level=1)
+
+    return doc
+
+
+def outermost(elems):
+    """Filter out the elements that are nested in another one of `elems`."""
+    selected = set(elems)
+
+    return [
+        elem for elem in elems if not any(_ in selected for _ in elem.iterancestors())
+    ]
 
 
 def extract_text(elem):
@@ -93,8 +430,9 @@ class CodeFile(object):
     DOMAIN_CPP = 2
     DOMAIN_PY = 5
 
-    def __init__(self, root):
+    def __init__(self, root, debug=False):
         self.root = root
+        self.debug = debug
         self.frontmatter = None
         self.domain = None
 
@@ -121,9 +459,9 @@ class CodeFile(object):
                 if len(subnest):
                     CodeFile.unnest_paragraphs(subnest, unnested)
                 else:
-                    unnested.append(deepcopy(elem))
+                    unnested.append(elem)
             else:
-                unnested.append(deepcopy(elem))
+                unnested.append(elem)
 
             dropped_elems.append(elem)
 
@@ -131,7 +469,7 @@ class CodeFile(object):
 
     def parse(self):
         self.preparser_format()
-        self.generate_frontmatter()
+        self.remove_title()
         self.parse_intro()
 
         self.pre_tidy_tree()
@@ -146,52 +484,51 @@ class CodeFile(object):
 
         self.tidy_tree()
 
+    @timed
     def preparser_format(self):
-        for elem in self.root.xpath(".//paragraph"):
-            if len(elem) or not elem.text:
-                continue
-
-            lines = elem.text.split("\n")
-            new_text = " ".join([_.strip() for _ in lines])
+        visitor = TreeVisitor()
+        visitor.register("paragraph", self.__join_paragraph_lines)
+        visitor.register(
+            "field_body",
+            self.__listify_method_params,
+            "parent::field[./field_name[text()='Parameters']]"
+            "/parent::field_list/parent::desc_content/parent::desc[@objtype='method']",
+        )
+        visitor.visit(self.root)
 
-            elem.text = new_text
+    def __join_paragraph_lines(self, elem):
+        if len(elem) or not elem.text:
+            return
 
-        for elem in self.root.xpath(
-            ".//desc[@objtype='method']/desc_content/field_list/field[./field_name[text()='Parameters']]/field_body"
-        ):
-            if p := elem.xpath("./paragraph"):
-                if len(p) != 1:
-                    raise RuntimeError("Unknown parsing condition!")
+        lines = elem.text.split("\n")
+        new_text = " ".join([_.strip() for _ in lines])
 
-                new_elem = E.bullet_list(E.list_item(deepcopy(p[0])))
-                # new_elem.append(deepcopy(p[0]))
+        elem.text = new_text
 
-                elem.remove(p[0])
+    def __listify_method_params(self, elem):
+        if p := xpath(elem, "./paragraph"):
+            if len(p) != 1:
+                raise RuntimeError("Unknown parsing condition!")
 
-                elem.append(new_elem)
+            new_elem = E.bullet_list(E.list_item(p[0]))
+            # new_elem.append(deepcopy(p[0]))
 
-                # ugly_dump(elem)
+            elem.append(new_elem)
 
-    def generate_frontmatter(self):
-        title_elem = self.root.find("./title")
-        page_title = extract_text(title_elem)
-        page_description = extract_text(self.root.find("./paragraph"))
-        timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S%z")
+            # ugly_dump(elem)
 
-        metadata: dict = {
-            "title": page_title,
-            "description": page_description,
-            "lastmod": timestamp,
-        }
-
-        self.frontmatter = generate_frontmatter.generate(metadata)
-        self.root.remove(title_elem)
+    @timed
+    def remove_title(self):
+        # The frontmatter is rendered from the processed document by `Renderer`,
+        # which takes the page title from the `document` element instead.
+        self.root.remove(self.root.find("./title"))
 
+    @timed
     def parse_intro(self):
         if self.domain == self.DOMAIN_C:
-            intro_tree = self.root.xpath("./container/preceding-sibling::paragraph")
+            intro_tree = xpath(self.root, "./container/preceding-sibling::paragraph")
         else:
-            intro_tree = self.root.xpath("./desc[1]/preceding-sibling::*")
+            intro_tree = xpath(self.root, "./desc[1]/preceding-sibling::*")
 
         intro_elems = []
         for elem in intro_tree:
@@ -218,112 +555,140 @@ class CodeFile(object):
         # for ix, _ in enumerate(unnested_elems):
         #     self.root.insert(ix, _)
 
+    @timed
     def pre_tidy_tree(self):
-        for elem in self.root.xpath(".//desc_signature"):
-            ids = elem.get("ids")
-            if ids:
-                new_id = ids.split(" ")[-1]
-                new_id = new_id.strip()
+        visitor = TreeVisitor()
+        visitor.register("desc_signature", self.__clean_signature_ids)
+        visitor.register(
+            "term", self.__strip_term_emphasis, "count(./*)<2 and ./strong"
+        )
+        visitor.register("index", self.__remove_elem)
+        visitor.register("desc_signature_line", self.__unwrap_signature_line)
+        visitor.visit(self.root)
 
-                elem.set("ids", new_id)
+    def __clean_signature_ids(self, elem):
+        ids = elem.get("ids")
+        if ids:
+            new_id = ids.split(" ")[-1]
+            new_id = new_id.strip()
 
-        terms_xpath = "//term[count(./*)<2 and ./strong]"
-        for elem in self.root.xpath(terms_xpath):
-            etree.strip_tags(elem, "strong")
-            elem.text = elem.text.strip()
+            elem.set("ids", new_id)
 
-        for elem in self.root.xpath(".//index"):
-            parent = elem.find("..")
-            parent.remove(elem)
+    def __strip_term_emphasis(self, elem):
+        etree.strip_tags(elem, "strong")
+        elem.text = elem.text.strip()
 
-        for elem in self.root.xpath(".//desc_signature_line"):
-            parent = elem.find("..")
-            parent.extend(list(deepcopy(elem)))
-            parent.remove(elem)
+    def __remove_elem(self, elem):
+        parent = elem.find("..")
+        parent.remove(elem)
+
+    def __unwrap_signature_line(self, elem):
+        parent = elem.find("..")
+        parent.extend(list(elem))
+        parent.remove(elem)
 
+    @timed
     def tidy_tree(self):
+        # Paragraphs nested in a paragraph that has already been unwrapped are
+        # left alone.
+        unwrapped = set()
+
+        visitor = TreeVisitor()
+        visitor.register("paragraph", partial(self.__unwrap_paragraph, unwrapped))
+        visitor.register("paragraph", self.__punctuate_paragraph)
+        visitor.register("title_reference", self.__space_title_reference)
+        visitor.visit(self.root)
+
+    def __unwrap_paragraph(self, unwrapped, elem):
+        if elem in unwrapped:
+            return
+        if elem.text and len(elem.text.strip()):
+            return
+        if elem.tail and len(elem.tail.strip()):
+            return
+        if len(elem) == 1:
+            only_child = elem.find("./*")
+
+            if only_child.text or len(only_child):
+                if only_child.tail and not only_child.tail.isspace():
+                    return
+        elif len(elem) > 1:
+            for child in xpath(elem, "./*"):
+                if child.tag not in {"strong", "title_reference"}:
+                    break
+            else:
+                return
 
-        for elem in self.root.xpath("//paragraph"):
-            if elem.text and len(elem.text.strip()):
-                continue
-            if elem.tail and len(elem.tail.strip()):
-                continue
-            if len(elem) == 1:
-                only_child = elem.find("./*")
-
-                if only_child.text or len(only_child):
-                    if only_child.tail and not only_child.tail.isspace():
-                        continue
-            elif len(elem) > 1:
-                for child in elem.xpath("./*"):
-                    if child.tag not in {"strong", "title_reference"}:
-                        break
-                else:
-                    continue
+            # print("Not skipping for:")
+            # ugly_dump(elem)
 
-                # print("Not skipping for:")
-                # ugly_dump(elem)
+        children = elem.getchildren()
+        if not len(children):
+            return
 
-            children = [deepcopy(_) for _ in elem.getchildren()]
-            if not len(children):
-                continue
+        unwrapped.update(elem.iter("paragraph"))
 
-            parent = elem.find("..")
+        parent = elem.find("..")
 
-            curr_ix = parent.index(elem)
-            parent.remove(elem)
+        curr_ix = parent.index(elem)
+        parent.remove(elem)
 
-            for ix, _ in enumerate(children):
-                parent.insert(curr_ix + ix, _)
+        for ix, _ in enumerate(children):
+            parent.insert(curr_ix + ix, _)
 
-        for elem in self.root.xpath("//paragraph"):
-            if not elem.text or len(elem.text.strip()) == 0:
-                if not elem.tail or len(elem.tail.strip()) == 0:
-                    if len(list(elem)) == 0:
-                        elem.find("..").remove(elem)
-                continue
+    def __punctuate_paragraph(self, elem):
+        # Unwrapped paragraphs have been removed from the tree.
+        if elem.getparent() is None:
+            return
 
-            if len(elem) and elem.text[-1] == " ":
-                continue
+        if not elem.text or len(elem.text.strip()) == 0:
+            if not elem.tail or len(elem.tail.strip()) == 0:
+                if len(list(elem)) == 0:
+                    elem.find("..").remove(elem)
+            return
 
-            elem.text = elem.text.strip()
+        if len(elem) and elem.text[-1] == " ":
+            return
 
-            if len(elem.text) == 0:
-                continue
+        elem.text = elem.text.strip()
+
+        if len(elem.text) == 0:
+            return
 
+        final_char = elem.text[-1]
+        if final_char in "\"'":
             final_char = elem.text[-1]
-            if final_char in "\"'":
-                final_char = elem.text[-1]
 
-            if final_char not in "!.?:,":
-                elem.text = f"{elem.text}."
+        if final_char not in "!.?:,":
+            elem.text = f"{elem.text}."
 
-        for elem in self.root.xpath("//title_reference"):
-            if (prev_sibling := elem.getprevious()) is not None:
-                if not prev_sibling.tail:
-                    prev_sibling.tail = " "
-                else:
-                    prev_sibling.tail += " "
+    def __space_title_reference(self, elem):
+        if (prev_sibling := elem.getprevious()) is not None:
+            if not prev_sibling.tail:
+                prev_sibling.tail = " "
             else:
-                parent = elem.getparent()
-                if not parent.text:
-                    parent.text = " "
-                else:
-                    parent.text += " "
+                prev_sibling.tail += " "
+        else:
+            parent = elem.getparent()
+            if not parent.text:
+                parent.text = " "
+            else:
+                parent.text += " "
 
+    @timed
     def _parse_c(self):
         if self.domain != self.DOMAIN_C:
             raise RuntimeError("_parse_c can only be called on Python definitions.")
 
         # Correct the domain
-        bad_domain_elems = self.root.xpath("//*[@domain='cpp' or @classes='cpp']")
+        bad_domain_elems = xpath(self.root, "//*[@domain='cpp' or @classes='cpp']")
         for elem in bad_domain_elems:
             if elem.get("domain", None) == "cpp":
                 elem.set("domain", "c")
             if (elem_classes := elem.get("classes", "")).find("cpp") > -1:
                 elem.set("classes", elem_classes.replace("cpp", "c"))
 
-        for elem in self.root.xpath(".//desc_signature/target"):
+        for elem in xpath(self.root, ".//desc_signature/target"):
             if not elem.tail:
                 continue
 
@@ -340,10 +705,9 @@ class CodeFile(object):
 
         # Move defines to a dedicated section
         defines_section = E.section(id="defines")
-        defines = self.root.xpath(".//desc[@objtype='macro']")
+        defines = xpath(self.root, ".//desc[@objtype='macro']")
         for elem in defines:
-            defines_section.append(deepcopy(elem))
-            elem.getparent().remove(elem)
+            defines_section.append(elem)
         if (typedef_section := self.root.find("./section[@id='typedefs']")) is not None:
             typedef_section.addprevious(defines_section)
         else:
@@ -356,10 +720,13 @@ class CodeFile(object):
 
         # Move structs to a dedicated section
         structs_section = E.section(id="structs")
-        structs = self.root.xpath(".//desc[@objtype='struct']")
+        structs = xpath(self.root, ".//desc[@objtype='struct']")
+        nested = set(structs) - set(outermost(structs))
         for elem in structs:
-            structs_section.append(deepcopy(self.__clean_struct(elem)))
-            elem.getparent().remove(elem)
+            # A nested struct is also kept in the struct it belongs to.
+            if elem in nested:
+                elem = deepcopy(elem)
+            structs_section.append(self.__clean_struct(elem))
         if (typedef_section := self.root.find("./section[@id='typedefs']")) is not None:
             typedef_section.addnext(structs_section)
         else:
@@ -367,10 +734,9 @@ class CodeFile(object):
 
         # Move enums to a dedicated section
         enums_section = E.section(id="enums")
-        enums = self.root.xpath(".//desc[@objtype='enum']")
+        enums = xpath(self.root, ".//desc[@objtype='enum']")
         for elem in enums:
-            enums_section.append(deepcopy(elem))
-            elem.getparent().remove(elem)
+            enums_section.append(elem)
         if (structs_section := self.root.find("./section[@id='structs']")) is not None:
             structs_section.addnext(enums_section)
         else:
@@ -383,8 +749,9 @@ class CodeFile(object):
 
         # Add contexts to individual functions, then move the functions to the top level
         functions_section = E.section(id="functions")
-        func_containers = self.root.xpath(
-            "./container[@objtype='user-defined' and ./desc[@objtype='function']]"
+        func_containers = xpath(
+            self.root,
+            "./container[@objtype='user-defined' and ./desc[@objtype='function']]",
         )
 
         contexts_list = {"": E.func_context("")}
@@ -401,10 +768,10 @@ class CodeFile(object):
                     E.desc_context(container_context)
                 )
 
-            for func in container.xpath("./desc[@objtype='function']"):
+            for func in xpath(container, "./desc[@objtype='function']"):
                 # func.insert(0, E.desc_context(container_context))
                 # func.set("context", container_context)
-                contexts_list[container_context].append(deepcopy(func))
+                contexts_list[container_context].append(func)
 
             container.getparent().remove(container)
 
@@ -437,10 +804,11 @@ class CodeFile(object):
         #     self.root.remove(wrapper)
 
         self._parse_cpp()
-        self.__clean_function(self.root.xpath(".//desc[@objtype='function']"))
-        self.__clean_enum(self.root.xpath(".//desc[@objtype='enum']"))
+        self.__clean_function(xpath(self.root, ".//desc[@objtype='function']"))
+        self.__clean_enum(xpath(self.root, ".//desc[@objtype='enum']"))
         self.__remove_reference_elems()
 
+    @timed
     def _parse_py(self):
         if self.domain != self.DOMAIN_PY:
             raise RuntimeError("_parse_py can only be called on Python definitions.")
@@ -454,7 +822,7 @@ class CodeFile(object):
         self.__remove_reference_elems()
 
         # Rename field and remove unnecessary attr
-        sig_names = self.root.xpath(".//desc_parameter/desc_sig_name")
+        sig_names = xpath(self.root, ".//desc_parameter/desc_sig_name")
         for sig_name in sig_names:
             parent = sig_name.find("..")
 
@@ -466,8 +834,8 @@ class CodeFile(object):
                     parent.remove(next_elem)
 
         # Rename default values field
-        default_value_elems = self.root.xpath(
-            ".//desc_parameter/inline[@classes='default_value']"
+        default_value_elems = xpath(
+            self.root, ".//desc_parameter/inline[@classes='default_value']"
         )
         for elem in default_value_elems:
             parent = elem.find("..")
@@ -480,15 +848,14 @@ class CodeFile(object):
         self.unnest_xpath(".//return_value", "./paragraph")
 
     def unnest_xpath(self, outer_xpath, inner_xpath):
-        outer_elems = self.root.xpath(outer_xpath)
+        outer_elems = xpath(self.root, outer_xpath)
         for outer_elem in outer_elems:
-            original_copy = deepcopy(outer_elem)
             if outer_elem.text:
                 outer_text = [outer_elem.text]
             else:
                 outer_text = []
 
-            inner_elems = outer_elem.xpath(inner_xpath)
+            inner_elems = xpath(outer_elem, inner_xpath)
             for elem in inner_elems:
                 if elem.text:
                     outer_text.append(elem.text)
@@ -499,20 +866,21 @@ class CodeFile(object):
             # outer_elem.addnext(original_copy)
 
     def __remove_unneeded_attrs(self):
-        attrs = self.root.xpath(
+        attrs = xpath(
+            self.root,
             ".//desc["
             "@domain='py' and "
             "@objtype='attribute' and "
             "./desc_signature/desc_name["
             "text()='__dict__' or text()='__weakref__' or text()='__module__'"
-            "]]"
+            "]]",
         )
 
         for attr in attrs:
             attr.find("..").remove(attr)
 
     def __rename_python_param_elems(self):
-        methods = self.root.xpath(".//desc[@objtype='method']")
+        methods = xpath(self.root, ".//desc[@objtype='method']")
 
         for method in methods:
             content = method.find("./desc_content")
@@ -523,30 +891,31 @@ class CodeFile(object):
                 continue
 
             definition_list = E.definition_list("")
-            for elem in field_list:
-                definition_list.append(deepcopy(elem))
+            definition_list.extend(list(field_list))
             content.replace(field_list, definition_list)
 
+    @timed
     def _parse_cpp(self):
         # if self.domain != self.DOMAIN_CPP:
         #     raise RuntimeError("_parse_cpp can only be called on C++ definitions.")
 
         # Remove the namespace wrapper
-        namespace_wrappers = self.root.xpath("./desc[@desctype='type']")
+        namespace_wrappers = xpath(self.root, "./desc[@desctype='type']")
         for wrapper in namespace_wrappers:
-            namespace_contents = wrapper.xpath(
+            namespace_contents = xpath(
+                wrapper,
                 "./desc_signature[./target[contains(@ids, 'namespace')]]"
-                "/following-sibling::desc_content[1]/*"
+                "/following-sibling::desc_content[1]/*",
             )
 
             ix = self.root.index(wrapper)
             for elem in namespace_contents:
-                self.root.insert(ix, deepcopy(elem))
+                self.root.insert(ix, elem)
                 ix += 1
 
             self.root.remove(wrapper)
 
-        for elem in self.root.xpath(".//desc_signature/target"):
+        for elem in xpath(self.root, ".//desc_signature/target"):
             if not elem.tail:
                 continue
 
@@ -558,27 +927,26 @@ class CodeFile(object):
         # Move typedefs to a dedicated section
         typedef_section = E.section(id="typedefs")
         typedef_xpath = self.root.find("./container[@objtype='typedef']")
-        for elem in typedef_xpath.xpath("./desc"):
-            typedef_section.append(deepcopy(elem))
+        for elem in xpath(typedef_xpath, "./desc"):
+            typedef_section.append(elem)
         typedef_xpath.find("..").replace(typedef_xpath, typedef_section)
 
         # Move exceptions to a dedicated section
         exception_section = E.section(id="exception_classes")
-        exception_classes = self.root.xpath(
-            "./desc[@objtype='class' and desc_signature//desc_name[contains(text(), 'Exception')]]"
+        exception_classes = xpath(
+            self.root,
+            "./desc[@objtype='class' and desc_signature//desc_name[contains(text(), 'Exception')]]",
         )
         for elem in exception_classes:
-            exception_section.append(deepcopy(elem))
-            self.root.remove(elem)
+            exception_section.append(elem)
         self.root.find("./section[@id='typedefs']").addnext(exception_section)
 
         # Move structs to a dedicated section
         structs_section = E.section(id="structs")
-        structs = self.root.xpath("./desc[@objtype='struct']")
+        structs = xpath(self.root, "./desc[@objtype='struct']")
         for elem in structs:
             # structs_section.append(deepcopy(elem))
-            structs_section.append(deepcopy(self.__clean_struct(elem)))
-            self.root.remove(elem)
+            structs_section.append(self.__clean_struct(elem))
         self.root.find("./section[@id='exception_classes']").addnext(structs_section)
 
         # # Move classes to a dedicated section
@@ -622,7 +990,7 @@ class CodeFile(object):
 
             return type_elem
 
-        for elem in self.root.xpath(".//desc_parameter[text()!='']"):
+        for elem in xpath(self.root, ".//desc_parameter[text()!='']"):
             if not elem.text or not len(elem.text):
                 continue
 
@@ -633,7 +1001,7 @@ class CodeFile(object):
             elem.text = ""
             elem.insert(0, type_elem)
 
-        for elem in self.root.xpath(".//desc_parameter/desc_annotation[position()=1]"):
+        for elem in xpath(self.root, ".//desc_parameter/desc_annotation[position()=1]"):
             param_type = elem.tail.strip()
             if not len(param_type):
                 continue
@@ -643,7 +1011,7 @@ class CodeFile(object):
             elem.tail = ""
             elem.addnext(type_elem)
 
-        for elem in self.root.xpath(".//desc_parameterlist/desc_parameter"):
+        for elem in xpath(self.root, ".//desc_parameterlist/desc_parameter"):
             if elem.find("./*[1]").tag != "desc_annotation":
                 elem.insert(0, E.desc_annotation(""))
 
@@ -661,7 +1029,7 @@ class CodeFile(object):
             type_elem.tail = ""
             type_elem.addnext(desc_ref)
 
-        for elem in self.root.xpath(".//desc_parameterlist/desc_parameter"):
+        for elem in xpath(self.root, ".//desc_parameterlist/desc_parameter"):
             ref_elem = elem.find("./desc_ref")
 
             if ref_elem is None:
@@ -669,18 +1037,18 @@ class CodeFile(object):
             if not ref_elem.tail or not len(ref_elem.tail.strip()):
                 ref_elem.tail = ""
 
+            # The replaced element keeps its tail, which holds the default value.
             old_elem = ref_elem.getnext()
-            default_val = deepcopy(old_elem)
             elem.replace(old_elem, E.desc_name(old_elem.text))
 
-            if default_val.tail and len(default_val.tail):
-                split_val = default_val.tail.split("=")
+            if old_elem.tail and len(old_elem.tail):
+                split_val = old_elem.tail.split("=")
                 if len(split_val) > 1:
                     val = E.default_value(split_val[1].strip())
                     ref_elem.getparent().append(val)
 
         ref_xpath = ".//desc[@objtype='function']//desc_signature/reference"
-        for elem in self.root.xpath(ref_xpath):
+        for elem in xpath(self.root, ref_xpath):
             prev_elem = elem.getprevious()
 
             if prev_elem is None:
@@ -700,8 +1068,8 @@ class CodeFile(object):
             parent = elem.find("..")
             parent.replace(elem, desc_ref)
 
-        source_file_name_elems = self.root.xpath(
-            ".//desc_content/*[1][name()='emphasis']"
+        source_file_name_elems = xpath(
+            self.root, ".//desc_content/*[1][name()='emphasis']"
         )
         for elem in source_file_name_elems:
             if elem.text is None:
@@ -717,8 +1085,8 @@ class CodeFile(object):
                     elem, E.source_file(source_file_name.strip("<> "))
                 )
 
-        function_sigs = self.root.xpath(
-            ".//desc[@objtype='function']//desc_signature/desc_returns"
+        function_sigs = xpath(
+            self.root, ".//desc[@objtype='function']//desc_signature/desc_returns"
         )
         for desc_return in function_sigs:
             if desc_return.getnext().tag != "desc_ref":
@@ -730,10 +1098,9 @@ class CodeFile(object):
     def __arrange_classes(self):
         # Move classes to a dedicated section
         classes_section = E.section(id="classes")
-        classes = self.root.xpath("./desc[@objtype='class']")
+        classes = xpath(self.root, "./desc[@objtype='class']")
         for elem in classes:
-            classes_section.append(deepcopy(elem))
-            self.root.remove(elem)
+            classes_section.append(elem)
 
         return classes_section
 
@@ -745,7 +1112,7 @@ class CodeFile(object):
 
         if self.domain == self.DOMAIN_C:
             ref_xpath = "./section[@id='functions' or @id='typedefs']" "//reference"
-        for elem in self.root.xpath(ref_xpath):
+        for elem in xpath(self.root, ref_xpath):
             reftitle = elem.get("reftitle", default=elem.text)
             new_ref = E.desc_type(reftitle)
 
@@ -759,13 +1126,14 @@ class CodeFile(object):
             parent.replace(elem, new_ref)
 
     def __clean_classes(self):
-        exception_classes = self.root.xpath(
-            ".//section[@id='exception_classes' or @id='classes']/desc"
+        exception_classes = xpath(
+            self.root, ".//section[@id='exception_classes' or @id='classes']/desc"
         )
         for obj in exception_classes:
-            self.__clean_class_signature(obj.xpath("desc_signature"))
+            with span("__clean_classes", obj):
+                self.__clean_class_signature(xpath(obj, "desc_signature"))
 
-            self.__clean_class_content(obj.xpath("desc_content"))
+                self.__clean_class_content(xpath(obj, "desc_content"))
 
     def __clean_class_content(self, elem_root):
         if type(elem_root) is list:
@@ -775,8 +1143,9 @@ class CodeFile(object):
 
         # Add contexts to individual functions, then move the functions to the top level
         # functions_section = E.div(id="functions")
-        func_containers = elem_root.xpath(
-            "./container[(@objtype='user-defined' or @objtype='public-func' or @objtype='private-attrib') and ./desc[@objtype='function' or @objtype='var']]"
+        func_containers = xpath(
+            elem_root,
+            "./container[(@objtype='user-defined' or @objtype='public-func' or @objtype='private-attrib') and ./desc[@objtype='function' or @objtype='var']]",
         )
 
         contexts_list = {"": E.func_context("")}
@@ -793,12 +1162,12 @@ class CodeFile(object):
                     E.desc_context(container_context)
                 )
 
-            for func in container.xpath(
-                "./desc[@objtype='function' or @objtype='var']"
+            for func in xpath(
+                container, "./desc[@objtype='function' or @objtype='var']"
             ):
                 # func.insert(0, E.desc_context(container_context))
                 # func.set("context", container_context)
-                contexts_list[container_context].append(deepcopy(func))
+                contexts_list[container_context].append(func)
 
             container.getparent().remove(container)
 
@@ -839,7 +1208,7 @@ class CodeFile(object):
         #     elem_root.remove(section)
 
         self.__clean_function(
-            elem_root.xpath(".//desc[@objtype='function' or @objtype='method']")
+            xpath(elem_root, ".//desc[@objtype='function' or @objtype='method']")
         )
 
     def debugging(self, elem_root):
@@ -867,6 +1236,7 @@ class CodeFile(object):
                 fp.write(etree.tostring(doc, encoding="unicode"))
                 fp.write("\n")
 
+    @traced
     def __clean_enum(self, elem_root):
         if type(elem_root) is list:
             for elem in elem_root:
@@ -875,25 +1245,23 @@ class CodeFile(object):
 
         content = elem_root.find("./desc_content")
 
-        enum_description = content.xpath(
-            "./desc[@objtype='enumerator'][1]/preceding-sibling::*"
+        enum_description = xpath(
+            content, "./desc[@objtype='enumerator'][1]/preceding-sibling::*"
         )
 
         desc = E.enum_description("")
         for elem in enum_description:
-            new_elem = deepcopy(elem)
-            # ugly_dump(new_elem)
+            # ugly_dump(elem)
 
-            if new_elem.text:
-                new_elem.text = new_elem.text.strip()
+            if elem.text:
+                elem.text = elem.text.strip()
             else:
-                new_elem.text = ""
+                elem.text = ""
 
-            desc.append(new_elem)
-            content.remove(elem)
+            desc.append(elem)
         content.insert(0, desc)
 
-        for elem in content.xpath("./desc[@objtype='enumerator']"):
+        for elem in xpath(content, "./desc[@objtype='enumerator']"):
             sub_content = elem.find("./desc_content")
             if len(sub_content):
                 continue
@@ -906,6 +1274,7 @@ class CodeFile(object):
             if len(sig):
                 sig.set("sig-type", "enumerator")
 
+    @traced
     def __clean_struct(self, elem_root):
         if type(elem_root) is list:
             for elem in elem_root:
@@ -914,74 +1283,68 @@ class CodeFile(object):
 
         content = elem_root.find("./desc_content")
 
-        struct_description = content.xpath(
-            "./container[@objtype='public-attrib'][1]/preceding-sibling::*"
+        struct_description = xpath(
+            content, "./container[@objtype='public-attrib'][1]/preceding-sibling::*"
         )
 
         desc = E.struct_description("")
         for elem in struct_description:
-            new_elem = deepcopy(elem)
-            # ugly_dump(new_elem)
+            # ugly_dump(elem)
 
-            if new_elem.text:
-                new_elem.text = new_elem.text.strip()
+            if elem.text:
+                elem.text = elem.text.strip()
             else:
-                new_elem.text = ""
+                elem.text = ""
 
-            desc.append(new_elem)
-            content.remove(elem)
+            desc.append(elem)
         content.insert(0, desc)
 
-        for elem in content.xpath("./container[@objtype='public-attrib']"):
-            for var in elem.xpath("./desc[@objtype='var']"):
+        for elem in xpath(content, "./container[@objtype='public-attrib']"):
+            for var in xpath(elem, "./desc[@objtype='var']"):
                 content.append(var)
 
             content.remove(elem)
 
         return elem_root
 
+    @traced
     def __clean_function(self, elem_root):
         if type(elem_root) is list:
             for elem in elem_root:
                 self.__clean_function(elem)
             return
 
-        self.debugging(elem_root)
+        if self.debug:
+            self.debugging(elem_root)
 
         content = elem_root.find("./desc_content")
 
         # Correct a weird issue apparently introduced by Sphinx or Breathe,
         # where the entire definition list somehow gets embedded in a paragraph.
-        def_list = content.xpath("./paragraph/definition_list")
+        def_list = xpath(content, "./paragraph/definition_list")
         # if def_list:
         for item in def_list:
             parent = item.find("../..")
-            parent.append(deepcopy(item))
+            parent.append(item)
             # new_def_list = content.append(deepcopy(def_list))
 
-            item.find("..").remove(item)
-
-        def_list = content.xpath("./bullet_list/list_item/definition_list")
+        def_list = xpath(content, "./bullet_list/list_item/definition_list")
         # if def_list:
         for item in def_list:
             parent = item.find("../../..")
-            parent.append(deepcopy(item))
+            parent.append(item)
             # new_def_list = content.append(deepcopy(def_list))
 
-            item.find("..").remove(item)
-
-        def_list = content.xpath(
-            "./paragraph/bullet_list/list_item/paragraph/definition_list"
+        def_list = xpath(
+            content, "./paragraph/bullet_list/list_item/paragraph/definition_list"
         )
         # if def_list:
         for item in def_list:
-            content.append(deepcopy(item))
+            content.append(item)
             # new_def_list = content.append(deepcopy(def_list))
 
-            item.find("..").remove(item)
-
-        def_list = content.xpath(
-            ".//paragraph/definition_list[../*[1][name()='literal_strong']]"
+        def_list = xpath(
+            content, ".//paragraph/definition_list[../*[1][name()='literal_strong']]"
         )
         for item in def_list:
             item.getprevious().tail += item.find("./definition_list_item/term").text
@@ -1007,34 +1370,31 @@ class CodeFile(object):
         #     def_list.find("..").remove(def_list)
 
         # Extract bullet lists that are nested within paragraphs
-        nested_bullets = content.xpath(".//paragraph/bullet_list")
-        for nested in nested_bullets:
+        nested_bullets = xpath(content, ".//paragraph/bullet_list")
+        for nested in outermost(nested_bullets):
             parent = nested.find("..")
-            parent.addnext(deepcopy(nested))
-            parent.remove(nested)
+            parent.addnext(nested)
 
         if self.domain == self.DOMAIN_CPP or self.domain == self.DOMAIN_C:
-            function_description = content.xpath(
-                "./definition_list/preceding-sibling::*"
+            function_description = xpath(
+                content, "./definition_list/preceding-sibling::*"
             )
         else:
-            function_description = content.xpath("./field_list/preceding-sibling::*")
+            function_description = xpath(content, "./field_list/preceding-sibling::*")
             # ugly_dump(content)
             # if (_ := content.find("./field_list")) :
             #     ugly_dump(_)
 
         desc = E.func_description("")
         for elem in function_description:
-            new_elem = deepcopy(elem)
-            # ugly_dump(new_elem)
+            # ugly_dump(elem)
 
-            if new_elem.text:
-                new_elem.text = new_elem.text.strip()
+            if elem.text:
+                elem.text = elem.text.strip()
             else:
-                new_elem.text = ""
+                elem.text = ""
 
-            desc.append(new_elem)
-            content.remove(elem)
+            desc.append(elem)
         content.insert(0, desc)
 
         # self.__rename_python_param_elems()
@@ -1050,9 +1410,9 @@ class CodeFile(object):
             def_items = []
         else:
             if self.domain == self.DOMAIN_CPP or self.domain == self.DOMAIN_C:
-                def_items = def_list.xpath("./definition_list_item")
+                def_items = xpath(def_list, "./definition_list_item")
             else:
-                def_items = def_list.xpath("./field")
+                def_items = xpath(def_list, "./field")
 
         for item in def_items:
             if self.domain == self.DOMAIN_CPP or self.domain == self.DOMAIN_C:
@@ -1062,11 +1422,11 @@ class CodeFile(object):
 
             if term.text in ("Parameters", "Exceptions", "Raises"):
                 if self.domain == self.DOMAIN_CPP or self.domain == self.DOMAIN_C:
-                    sub_items = item.xpath("./definition/bullet_list/list_item")
+                    sub_items = xpath(item, "./definition/bullet_list/list_item")
                 else:
-                    sub_items = item.xpath("./field_body/bullet_list/list_item")
+                    sub_items = xpath(item, "./field_body/bullet_list/list_item")
                     if len(sub_items) == 0:
-                        sub_items = item.xpath("./field_body")
+                        sub_items = xpath(item, "./field_body")
                         # [ugly_dump(_) for _ in sub_items]
                 if sub_items is None:
                     continue
@@ -1076,8 +1436,7 @@ class CodeFile(object):
                 if content_type_term == "raises":
                     content_type_term = "exceptions"
                 new_list.set("content-type", content_type_term)
-                for _ in sub_items:
-                    new_list.append(deepcopy(_))
+                new_list.extend(sub_items)
 
                 if content_type_term == "parameters":
                     content.insert(1, new_list)
@@ -1093,7 +1452,7 @@ class CodeFile(object):
                 else:
                     val = item.find("./field_body")
 
-                new_item.extend(deepcopy(val).getchildren())
+                new_item.extend(val.getchildren())
 
                 # new_item[-1].tail = " And here's some follower text!"
 
@@ -1106,7 +1465,7 @@ class CodeFile(object):
 
                     val = item.find("./field_body")
 
-                    new_item.extend(deepcopy(val).getchildren())
+                    new_item.extend(val.getchildren())
 
                     content.append(new_item)
                     item.find("..").remove(item)
@@ -1115,8 +1474,8 @@ class CodeFile(object):
             content.remove(def_list)
 
         if self.domain == self.DOMAIN_PY:
-            literal_emph = content.xpath(
-                ".//definition_list//list_item//literal_emphasis"
+            literal_emph = xpath(
+                content, ".//definition_list//list_item//literal_emphasis"
             )
 
             for elem in literal_emph:
@@ -1161,7 +1520,7 @@ class CodeFile(object):
                         param_values[1:],
                     )
 
-                param_list.replace(param, deepcopy(new_item))
+                param_list.replace(param, new_item)
 
         exceptions_list = content.find("./definition_list[@content-type='exceptions']")
         # if exceptions_list:
@@ -1177,8 +1536,8 @@ class CodeFile(object):
                     exc_name = exc_line.text.strip()
                     exc_desc = exc_line.tail
                 else:
-                    exc_line = exc_values[0].xpath(
-                        "./*[starts-with(name(), 'literal')]"
+                    exc_line = xpath(
+                        exc_values[0], "./*[starts-with(name(), 'literal')]"
                     )[0]
                     exc_name = exc_line.text.strip()
 
@@ -1199,8 +1558,7 @@ class CodeFile(object):
 
                 if len(exc_values[0]):
                     for _ in exc_values[0]:
-                        exc_desc_elem.append(deepcopy(_))
-                        _.find("..").remove(_)
+                        exc_desc_elem.append(_)
 
                 if len(exc_values) > 1:
                     exc_desc_elem.extend(exc_values[1:])
@@ -1211,8 +1569,7 @@ class CodeFile(object):
 
         return_value_elem = content.find("./return_value")
         if return_value_elem is not None:
-            content.append(deepcopy(return_value_elem))
-            content.remove(return_value_elem)
+            content.append(return_value_elem)
 
     WRITE_VAR = False
 
@@ -1229,6 +1586,8 @@ class CodeFile(object):
         param_desc_elem = E.param_desc("")
 
         if not first_child.tail:
+            from .utils import ugly_dump
+
             print("NO TAIL!:")
             ugly_dump(param_elems)
         else:
@@ -1251,14 +1610,13 @@ class CodeFile(object):
             param_desc_elem.text = " ".join(fixed_newlines)
 
             while (next_elem := next(children, None)) is not None:
-                param_desc_elem.append(deepcopy(next_elem))
-                next_elem.find("..").remove(next_elem)
+                param_desc_elem.append(next_elem)
 
         # If the tail is " (", then it means that a type is specified.
         # We have to consider a few things about how we process this.
         else:
 
-            type_literals = param_elems.xpath("./literal[contains(@classes, 'xref')]")
+            type_literals = xpath(param_elems, "./literal[contains(@classes, 'xref')]")
 
             if len(type_literals) == 1:
                 param_type_elem.text = type_literals[0].text.strip()
@@ -1295,15 +1653,10 @@ class CodeFile(object):
                     param_desc_elem.text = param_desc_elem.text.strip(" –")
                     param_desc_elem.text = param_desc_elem.text.strip()
 
-            remaining_elems = list(param_elems)
-            for _ in remaining_elems:
-                param_desc_elem.append(deepcopy(_))
-                param_elems.remove(_)
+            param_desc_elem.extend(list(param_elems))
 
         if tail_elems:
-            for _ in tail_elems:
-                param_desc_elem.append(deepcopy(_))
-                _.find("..").remove(_)
+            param_desc_elem.extend(tail_elems)
 
         if param_type_elem is not None:
             new_item.append(param_type_elem)
@@ -1343,9 +1696,9 @@ class CodeFile(object):
                 new_parent.addnext(parent_name)
 
     def __clean_typedefs(self):
-        typedefs = self.root.xpath(".//section[@id='typedefs']/desc")
+        typedefs = xpath(self.root, ".//section[@id='typedefs']/desc")
         for obj in typedefs:
-            self.__clean_typedef_signature(obj.xpath("desc_signature"))
+            self.__clean_typedef_signature(xpath(obj, "desc_signature"))
 
     def __clean_typedef_signature(self, elem_root):
         if type(elem_root) is list:
@@ -1356,7 +1709,7 @@ class CodeFile(object):
         self.__remove_unneeded_returns(elem_root)
         self.__fix_elem_spacing(elem_root, "desc_annotation")
 
-        for elem in elem_root.xpath(".//desc_annotation"):
+        for elem in xpath(elem_root, ".//desc_annotation"):
             if elem.tail:
                 desc_type = E.desc_type(elem.tail.strip())
                 elem.tail = ""
@@ -1367,7 +1720,7 @@ class CodeFile(object):
 
     def __remove_unneeded_returns(self, elem_root):
         # Remove `returns` statement from typedef signatures
-        for elem in elem_root.xpath(".//desc_returns"):
+        for elem in xpath(elem_root, ".//desc_returns"):
             elem_root.remove(elem)
 
     def __fix_elem_spacing(self, elem_root, tags):
@@ -1377,7 +1730,7 @@ class CodeFile(object):
             return
 
         tag = f".//{tags}"
-        for elem in elem_root.xpath(tag):
+        for elem in xpath(elem_root, tag):
             if elem.text:
                 elem.text = elem.text.strip()
 
@@ -0,0 +1,205 @@
+import os
+from hashlib import sha256
+from pathlib import Path
+
+PWD = (Path(__file__).resolve()).parent
+
+MANIFEST_NAME = ".hugoify-cache.json"
+MANIFEST_VERSION = 1
+
+
+def hash_file(path):
+    digest = sha256()
+
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 16), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def atomic_write(path, data):
+    """Replace the contents of `path` with the bytes `data` in one step.
+
+    The data is written to a temporary file next to `path`, which is then
+    renamed over it, so readers never see a partially written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as fp:
+            fp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_if_changed(path, text):
+    """Write `text` to `path`, unless the file already has the same content.
+
+    Unchanged files keep their modification time, so tools that watch the
+    output (e.g. Hugo) don't rebuild them. Returns whether `path` was written.
+    """
+    data = text.encode("utf-8")
+
+    try:
+        if os.stat(path).st_size == len(data):
+            if hash_file(path) == sha256(data).hexdigest():
+                return False
+    except FileNotFoundError:
+        pass
+
+    atomic_write(path, data)
+    return True
+
+
+def get_lastmod(path):
+    """Return the modification time of `path` as an RFC 3339 timestamp."""
+    from datetime import datetime, timezone
+
+    mtime = datetime.fromtimestamp(os.stat(path).st_mtime, timezone.utc)
+    return mtime.isoformat(timespec="seconds")
+
+
+def get_version():
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return "unknown"
+
+    try:
+        return version("hugoify")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_fingerprint():
+    """Identify the version of hugoify that produced a set of outputs.
+
+    Any change to the installed version, to the source of the package or to
+    one of the bundled stylesheets invalidates every entry in a manifest
+    written by another version. The source is hashed because the version
+    isn't bumped for every change (and is unknown in a development checkout).
+    """
+    sources = {f.name: hash_file(f) for f in sorted(PWD.glob("*.py"))}
+    stylesheets = {f.name: hash_file(f) for f in sorted((PWD / "xslt").glob("*.xslt"))}
+
+    return {
+        "version": get_version(),
+        "sources": sources,
+        "stylesheets": stylesheets,
+    }
+
+
+class BuildManifest:
+    """Track the inputs that were used to render each file in `output_dir`.
+
+    The manifest maps the name of each raw `*_api.xml` file to the SHA-256
+    digest of its content, the name of the Markdown file rendered from it and
+    the `lastmod` timestamp of that page, which allows unchanged inputs to be
+    skipped on the next run. The entries of a manifest written by a different
+    version only keep their digest and `lastmod`, so every page is rendered
+    again, but the pages of unchanged inputs keep their timestamps.
+    """
+
+    def __init__(self, output_dir, fingerprint=None):
+        self.path = Path(output_dir) / MANIFEST_NAME
+        self.fingerprint = get_fingerprint() if fingerprint is None else fingerprint
+        self.entries = {}
+        self._saved = None
+
+        if not self.path.exists():
+            return
+
+        import json
+
+        try:
+            with self.path.open("r") as fp:
+                self._saved = fp.read()
+            data = json.loads(self._saved)
+        except (OSError, ValueError):
+            print(f"Ignoring unreadable build manifest {self.path}...")
+            return
+
+        if data.get("manifest_version") != MANIFEST_VERSION:
+            return
+        self.entries = data.get("files", {})
+
+        if data.get("fingerprint") != self.fingerprint:
+            print("Ignoring build manifest written by a different version...")
+            self.entries = {
+                name: {"sha256": entry["sha256"], "lastmod": entry["lastmod"]}
+                for name, entry in self.entries.items()
+                if entry.get("sha256") and entry.get("lastmod")
+            }
+
+    def clear(self):
+        self.entries = {}
+
+    def get(self, input_file):
+        return self.entries.get(Path(input_file).name)
+
+    def is_current(self, input_file, digest, output_file):
+        entry = self.get(input_file)
+
+        if entry is None or entry.get("sha256") != digest:
+            return False
+
+        output_file = Path(output_file)
+        return output_file.name == entry.get("output") and output_file.exists()
+
+    def get_lastmod(self, input_file, digest):
+        """Return the `lastmod` timestamp of the page rendered from `input_file`.
+
+        The timestamp recorded for the same content is reused, so that
+        re-rendering an unchanged input produces an identical page, even after
+        an upgrade. Otherwise, the modification time of the input file is used.
+        """
+        entry = self.get(input_file)
+
+        if entry is not None and entry.get("sha256") == digest:
+            if lastmod := entry.get("lastmod"):
+                return lastmod
+
+        return get_lastmod(input_file)
+
+    def update(self, input_file, digest, output_file, lastmod=None):
+        entry = {
+            "sha256": digest,
+            "output": Path(output_file).name,
+        }
+        if lastmod is not None:
+            entry["lastmod"] = lastmod
+
+        self.entries[Path(input_file).name] = entry
+
+    def prune(self, input_files):
+        """Drop the entries of the files not in `input_files`, returning them."""
+        keep = {Path(_).name for _ in input_files}
+
+        pruned = {k: v for k, v in self.entries.items() if k not in keep}
+        self.entries = {k: v for k, v in self.entries.items() if k in keep}
+
+        return pruned
+
+    def dumps(self):
+        import json
+
+        data = {
+            "manifest_version": MANIFEST_VERSION,
+            "fingerprint": self.fingerprint,
+            "files": dict(sorted(self.entries.items())),
+        }
+
+        return json.dumps(data, indent=2) + "\n"
+
+    def save(self):
+        text = self.dumps()
+        if text == self._saved:
+            return
+
+        atomic_write(self.path, text.encode("utf-8"))
+        self._saved = text
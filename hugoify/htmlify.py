@@ -1,27 +1,22 @@
 import os, sys
 from pathlib import Path
-from html import unescape
 from lxml import etree
-from lxml import html
 from lxml.builder import E
 
-from copy import deepcopy
+from .utils import _reserialize
 
-from pprint import pprint
-
-from .utils import partial_dump, ugly_dump, verbose_dump, unserialize, _reserialize
-
-from typing import Union, List
-from contextlib import contextmanager
-from collections.abc import MutableMapping
-from .parser_utils import DocTree, Node
+from collections import Counter
+from .parser_utils import RenderContext, Node
+from .xpaths import xpath
+from .stylesheets import render_frontmatter
+from .instrument import timed, span
+from .cache import write_if_changed
 
 import re
-from re import sub as re_sub
 
 from hashlib import md5
 
-from itertools import chain
+from functools import partial
 import warnings
 
 warnings.filterwarnings("once", category=RuntimeWarning)
@@ -34,10 +29,43 @@ class NotImplementedWarning(UserWarning):
         self.mesage = message
 
 
+# Short phrases in curly or single quotes, which `Renderer.tidy_text` puts in
+# double quotes. Both start with the same literal, so they're matched in one pass.
+QUOTED_PHRASE = re.compile(r"&#82(?:21;([\w -]+?)&#8221;|16;([\w -]+?)&#8217;)")
+
+# A string default value, e.g. `'fast'`. Default values are matched in the tree
+# rather than in the serialized text, where anything but ASCII is escaped.
+SINGLE_QUOTED = re.compile(r"'([\w -]+?)'", re.ASCII)
+
+
+# Marks where the output of each top-level object of a section starts, when the
+# render cache is used. `key` is the object's cache key, or empty if the object
+# isn't cached.
+FRAGMENT_TAG = "hugoify-fragment"
+FRAGMENT_MARKER = re.compile(
+    rf'<{FRAGMENT_TAG} key="([0-9a-f]*)"(?:></{FRAGMENT_TAG}>|/>)'
+)
+
+
+def _double_quote(match):
+    return f"&#8220;{match[1] or match[2]}&#8221;"
+
+
+def _skip_node(renderer, node, context=None, **kwargs):
+    return None
+
+
 def get_abs(relative):
     return str(PWD / relative)
 
 
+def get_rendered_path(input_file, output_dir):
+    output_filename = Path(input_file).stem.replace("-processed", "")
+    output_filename = output_filename.replace("GENERATED_", "")
+
+    return Path(output_dir) / f"{output_filename}.md"
+
+
 def htmlify(input_dir, output_dir):
     if not input_dir:
         input_dir = Path(os.environ["INPUT_RAWPATH"])
@@ -56,126 +84,253 @@ def htmlify(input_dir, output_dir):
 
 
 class Renderer:
-    def __init__(self, input_file, output_dir):
+    # Tags that are rendered according to the value of one of their attributes,
+    # e.g. a `desc` with `objtype="method"` is handled by `_parse_node_desc_method`.
+    SUBTYPE_ATTRS = {
+        "desc": "objtype",
+        "definition_list": "content-type",
+    }
+
+    # Elements rendered as a `div` of the given class, which wraps the rendered
+    # children of the element.
+    BLOCK_CLASSES = {
+        ("desc", "class"): "class",
+        ("desc", "method"): "method",
+        ("desc", "function"): "method",
+        ("desc", "var"): "struct-var",
+        ("desc", "struct"): "struct",
+        ("desc", "enum"): "enum",
+        ("desc", "enumerator"): "enum-value",
+        ("desc", "attribute"): "attribute",
+        ("func_context", None): "context",
+    }
+
+    # The top-level objects of a section whose output is kept in the render cache.
+    CACHED_TAGS = {"desc", "func_context"}
+
+    def __init__(
+        self, input_file, output_dir, document=None, render_cache=None, lastmod=None
+    ):
+        """Render a processed document to Markdown.
+
+        If `document` is given, it should be the `document` element built from
+        `input_file`, and it will be rendered directly (and modified in place)
+        instead of loading the `-processed.xml` file from disk.
+
+        If `render_cache` is given, the output of each top-level object is
+        reused from that `RenderCache` when the object hasn't changed.
+
+        `lastmod` is the timestamp used for the page's `lastmod` frontmatter.
+        """
         print(f"Processing {str(input_file)}...")
 
         # self.current_path = []
 
         self.input_file = input_file.resolve()
 
-        output_filename = self.input_file.stem.replace("-processed", "")
-        output_filename = output_filename.replace("GENERATED_", "")
-
-        self.rendered_file = output_dir / f"{output_filename}.md"
+        self.rendered_file = get_rendered_path(self.input_file, output_dir)
         # self.rendered_lines = []
         self.rendered_trees = []
 
-        tree = etree.parse(
-            str(self.input_file),
-            parser=etree.XMLParser(load_dtd=True, no_network=False, recover=True),
-        )
-        self.document_root = _reserialize(tree.getroot())
+        # How often each `(tag, subtype)` handler was called, and how many
+        # elements had an unexpected tail, for the run report.
+        self.handler_calls = Counter()
+        self.tail_warnings = 0
+
+        # Whether the rendered file was written, or already up to date.
+        self.rewritten = False
+
+        self.render_cache = render_cache
+        # The fragments of the current document that were found in the cache.
+        self.cached_fragments = {}
+
+        if document is None:
+            tree = etree.parse(
+                str(self.input_file),
+                parser=etree.XMLParser(load_dtd=True, no_network=False, recover=True),
+            )
+            document = tree.getroot()
+            generated_frontmatter = render_frontmatter(document, lastmod)
+
+            self.document_root = _reserialize(document)
+        else:
+            generated_frontmatter = render_frontmatter(document, lastmod)
 
-        frontmatter = etree.XSLT(etree.parse(get_abs("xslt/frontmatter.xslt")))
-        generated_frontmatter = str(frontmatter(tree.getroot())).lstrip()
+            etree.indent(document, space="  ", level=0)
+            self.document_root = document
 
         self.toc = {}
 
-        self.parse_section(self.document_root.xpath("./section"))
+        self.parse_section(xpath(self.document_root, "./section"))
 
-        with self.rendered_file.open("w") as fp:
-            fp.write(generated_frontmatter)
-            for block in self.rendered_trees:
+        self.frontmatter = generated_frontmatter
+        self.write(self.render())
 
-                raw = block.raw()
+    def render(self):
+        """Return the Markdown for the whole document."""
+        rendered = [self.frontmatter]
 
-                for elem in raw.xpath(".//span[@class='pointer-ref']"):
-                    elem.tail = elem.tail.strip()
+        # The rendered trees are consumed, so each one can be freed as soon as
+        # it has been serialized.
+        blocks, self.rendered_trees = self.rendered_trees, []
+        for ix, block in enumerate(blocks):
+            blocks[ix] = None
+            rendered.append(self.render_block(block))
+            rendered.append("\n")
 
-                    # ugly_dump(elem)
+        return "".join(rendered)
 
-                for child in raw.getchildren():
-                    dumped = etree.tostring(
-                        child, encoding="unicode", pretty_print=True
-                    )
-                    reparsed = etree.fromstring(
-                        dumped, parser=etree.XMLParser(recover=True)
-                    )
+    @timed
+    def write(self, text):
+        self.rewritten = write_if_changed(self.rendered_file, text)
+        if not self.rewritten:
+            print(f"{self.rendered_file} is unchanged...")
 
-                    for subchild in reparsed.getchildren():
-                        etree.indent(subchild, space="  ", level=0)
+    @timed
+    def render_block(self, block):
+        """Serialize a rendered section, applying the Markdown-specific fixups."""
+        raw = block.raw(release=True)
 
-                    raw.replace(child, reparsed)
+        for elem in xpath(raw, ".//span[@class='pointer-ref']"):
+            elem.tail = elem.tail.strip()
 
-                etree.indent(raw, space="", level=0)
+            # ugly_dump(elem)
 
-                for subelem in raw.iter():
-                    if subelem.text is None:
-                        subelem.text = ""
+        self.normalize_whitespace(raw)
+        if self.render_cache is not None:
+            for marker in raw.iter(FRAGMENT_TAG):
+                marker.tail = ""
 
-                # before_reparse = (
-                #     self.rendered_file.parent
-                #     / self.rendered_file.name.replace(".md", "unreparsed.md")
-                # )
-                # with before_reparse.open("w") as new_fp:
-                #     new_fp.write(etree.tostring(raw).decode("utf-8"))
+        # before_reparse = (
+        #     self.rendered_file.parent
+        #     / self.rendered_file.name.replace(".md", "unreparsed.md")
+        # )
+        # with before_reparse.open("w") as new_fp:
+        #     new_fp.write(etree.tostring(raw).decode("utf-8"))
 
-                for header in raw.xpath(".//*[contains(@class, 'include-toc')]"):
-                    header.tail = f"\n{header.tail}"
+        for header in xpath(raw, ".//*[contains(@class, 'include-toc')]"):
+            header.tail = f"\n{header.tail}"
 
-                    parent = header.getparent()
-                    if parent.index(header) == 0:
-                        parent.text = f"\n{parent.text}"
+            parent = header.getparent()
+            if parent.index(header) == 0:
+                parent.text = f"\n{parent.text}"
 
-                    self.strip_newlines(header)
+            self.strip_newlines(header)
 
-                    heading_level = header.tag.replace("h", "")
-                    children_line = deepcopy(header.getchildren())
-                    # for elem in children_line:
-                    #     ugly_dump(elem)
+            heading_level = header.tag.replace("h", "")
+            children_line = header.getchildren()
+            # for elem in children_line:
+            #     ugly_dump(elem)
 
-                    heading_line_classes = [
-                        f"markdown-h{heading_level}",
-                        header.get("class"),
-                    ]
-                    if header.getparent().get("class").find("attribute") > -1:
-                        heading_line_classes.append("attribute-signature")
+            heading_line_classes = [
+                f"markdown-h{heading_level}",
+                header.get("class"),
+            ]
+            if header.getparent().get("class").find("attribute") > -1:
+                heading_line_classes.append("attribute-signature")
 
-                    heading_line = E.span()
-                    heading_line.text = header.text.strip()
-                    heading_line.set(
-                        "class",
-                        " ".join(heading_line_classes),
-                    )
-                    heading_line.extend(children_line)
+            heading_line = E.span()
+            heading_line.text = header.text.strip()
+            heading_line.set(
+                "class",
+                " ".join(heading_line_classes),
+            )
+            heading_line.extend(children_line)
 
-                    self.reparse_heading_line(heading_line)
-                    self.generate_heading_id(heading_line)
+            self.reparse_heading_line(heading_line)
+            self.generate_heading_id(heading_line)
 
-                    header.addnext(heading_line)
-                    header.getparent().replace(
-                        header, E(f"heading_level_{heading_level}")
-                    )
+            header.addnext(heading_line)
+            self.replace_with_text(header, f'{"#" * int(heading_level)} ')
 
-                self.reparse_misc(raw)
+        self.reparse_misc(raw)
+        self.quote_default_values(raw)
 
-                # for subelem in raw.iter():
-                #     if subelem.tag.find("heading_level") > -1:
-                #         continue
-                #     if subelem.text is None:
-                #         subelem.text = ""
+        # for subelem in raw.iter():
+        #     if subelem.tag.find("heading_level") > -1:
+        #         continue
+        #     if subelem.text is None:
+        #         subelem.text = ""
 
-                text = etree.tostring(
-                    raw,
-                    # pretty_print=True,
-                ).decode("utf-8")
+        text = etree.tostring(
+            raw,
+            # pretty_print=True,
+        ).decode("utf-8")
 
-                text = self.tidy_text(text)
-                text = self.replace_headers(text)
-                fp.write(text)
-                fp.write("\n")
+        if self.render_cache is not None:
+            text = self.splice_fragments(text, f"</{raw.tag}>")
 
-                # etree.indent(raw, space="  ")
+        text = self.tidy_text(text)
+
+        return text
+
+    def splice_fragments(self, text, end_tag):
+        """Replace the fragment markers in `text` with the cached fragments.
+
+        The output of each object that wasn't cached is added to the cache. The
+        output of the last object is followed by `end_tag`, which closes the
+        rendered section.
+        """
+        parts = FRAGMENT_MARKER.split(text)
+        spliced = [parts[0]]
+
+        last = len(parts) - 2
+        for ix in range(1, len(parts), 2):
+            key, fragment = parts[ix], parts[ix + 1]
+
+            if (cached := self.cached_fragments.get(key)) is not None:
+                spliced.append(cached)
+                spliced.append(fragment)
+                continue
+
+            if key:
+                if ix == last:
+                    self.render_cache.put(key, fragment.removesuffix(end_tag))
+                else:
+                    self.render_cache.put(key, fragment)
+
+            spliced.append(fragment)
+
+        return "".join(spliced)
+
+    @staticmethod
+    def normalize_whitespace(raw):
+        """Normalize the whitespace of a rendered block before it is serialized.
+
+        Whitespace-only text and tails are replaced with a single newline, and
+        missing text is replaced with an empty string. The tails of the direct
+        children of the block are discarded.
+        """
+        for child in raw:
+            child.tail = None
+
+        etree.indent(raw, space="", level=0)
+
+        for subelem in raw.iter():
+            if subelem.text is None:
+                subelem.text = ""
+
+    @staticmethod
+    def replace_with_text(elem, text):
+        """Replace `elem` (along with its tail) with `text`."""
+        parent = elem.getparent()
+
+        if (prev_elem := elem.getprevious()) is not None:
+            prev_elem.tail = f"{prev_elem.tail or ''}{text}"
+        else:
+            parent.text = f"{parent.text or ''}{text}"
+
+        parent.remove(elem)
+
+    @staticmethod
+    def quote_default_values(raw):
+        """Use double quotes around simple string default values."""
+        for elem in xpath(raw, ".//span[@class='default-val']"):
+            if len(elem) or len(elem.attrib) > 1 or elem.text is None:
+                continue
+
+            if match := SINGLE_QUOTED.fullmatch(elem.text):
+                elem.text = f'"{match[1]}"'
 
     @staticmethod
     def add_space_to_tail(elem):
@@ -193,11 +348,12 @@ class Renderer:
 
     def reparse_misc(self, raw):
 
-        for annotation in raw.xpath(".//span[contains(@class, 'annotation')]"):
+        for annotation in xpath(raw, ".//span[contains(@class, 'annotation')]"):
             self.add_space_to_tail(annotation)
 
-        for open_paren in raw.xpath(
-            ".//span[contains(@class, 'param-paren') and contains(@class, 'paren-open')]"
+        for open_paren in xpath(
+            raw,
+            ".//span[contains(@class, 'param-paren') and contains(@class, 'paren-open')]",
         ):
             if open_paren.getnext().get("class").find("paren-close") == -1:
                 continue
@@ -206,18 +362,21 @@ class Renderer:
 
             open_paren.tail = open_paren.tail.lstrip(" ")
 
-        for param_elem in raw.xpath(
-            ".//span[contains(@class, 'param') and not(contains(@class, 'param-'))]"
+        for param_elem in xpath(
+            raw,
+            ".//span[contains(@class, 'param') and not(contains(@class, 'param-'))]",
         ):
-            for param_name in param_elem.xpath("./span[contains(@class, 'name')]"):
+            for param_name in xpath(param_elem, "./span[contains(@class, 'name')]"):
                 if (next_param := param_name.getnext()) is not None:
                     continue
 
                 self.rm_space_from_tail(param_name)
 
-        for param_list in raw.xpath(".//div[contains(@class, 'parameters')]"):
-            for param_item in param_list.xpath(".//li[contains(@class, 'param-item')]"):
-                for param_type in param_item.xpath("./span[@class='type']"):
+        for param_list in xpath(raw, ".//div[contains(@class, 'parameters')]"):
+            for param_item in xpath(
+                param_list, ".//li[contains(@class, 'param-item')]"
+            ):
+                for param_type in xpath(param_item, "./span[@class='type']"):
                     if param_type.text is None or param_type.text == "":
                         continue
                     if param_type.text == "TYPE":
@@ -233,7 +392,7 @@ class Renderer:
                     closer_elem.set("class", "type-paren paren-close")
                     param_type.addnext(closer_elem)
 
-                for param_desc in param_item.xpath("./span[@class='description']"):
+                for param_desc in xpath(param_item, "./span[@class='description']"):
                     if (param_desc.text is None or param_desc.text == "") and not len(
                         param_desc.getchildren()
                     ):
@@ -247,9 +406,9 @@ class Renderer:
                     if prev_elem.tail is not None:
                         prev_elem.tail = prev_elem.tail.rstrip()
 
-        for return_val in raw.xpath(".//div[contains(@class, 'returns')]"):
-            for return_type in return_val.xpath(
-                ".//span[contains(@class, 'return_type')]"
+        for return_val in xpath(raw, ".//div[contains(@class, 'returns')]"):
+            for return_type in xpath(
+                return_val, ".//span[contains(@class, 'return_type')]"
             ):
                 if (return_type.text is None or return_type.text == "") and not len(
                     return_type.getchildren()
@@ -266,7 +425,7 @@ class Renderer:
                 if return_type.tail is not None:
                     return_type.tail = return_type.tail.rstrip()
 
-        for returns_elem in raw.xpath(".//span[@class='returns']"):
+        for returns_elem in xpath(raw, ".//span[@class='returns']"):
             # if returns_elem.getnext().get("class").find("name") == -1:
             #     continue
             # if open_paren.tail is None:
@@ -282,7 +441,7 @@ class Renderer:
         method or commas between each parameter. This method adds those elements
         to the header lines.
         """
-        param_list = line.xpath("./span[contains(@class, 'param-list')]")
+        param_list = xpath(line, "./span[contains(@class, 'param-list')]")
 
         if len(param_list):
             param_list = param_list[0]
@@ -310,7 +469,7 @@ class Renderer:
                 elem.text = elem.text.replace("_", "\_")
                 elem.text = elem.text.replace("*", "\*")
 
-        for param in param_list.xpath("./span[@class='param']"):
+        for param in xpath(param_list, "./span[@class='param']"):
             # old_tail = ""
             if param.tail is not None:
                 param.tail = param.tail.strip()
@@ -331,15 +490,17 @@ class Renderer:
             param_wrapper = E.span()
             param_wrapper.set("class", "param-item-wrapper")
 
-            param_wrapper.append(deepcopy(param))
+            next_elem = param.getnext()
 
-            if (next_elem := param.getnext()) is not None:
+            # Moving the parameter into the wrapper takes its tail with it.
+            param.addprevious(param_wrapper)
+            param_wrapper.append(param)
+
+            if next_elem is not None:
                 if next_elem.get("class") == "param":
                     param_wrapper.append(param_tail)
 
-            param.getparent().replace(param, param_wrapper)
-
-        for elem in param_list.xpath(".//span[@class='default-val']"):
+        for elem in xpath(param_list, ".//span[@class='default-val']"):
             prev_elem = elem.getprevious()
             prev_elem.tail = " = "
 
@@ -355,7 +516,7 @@ class Renderer:
 
                     elem.tail = f"{old_tail} "
 
-        for param in param_list.xpath("./span[@class='param']"):
+        for param in xpath(param_list, "./span[@class='param']"):
             for field in {"annotation", "type", "name"}:
                 if (elem := param.find(f"./span[@class='{field}']")) is not None:
                     if elem.text is None:
@@ -365,25 +526,6 @@ class Renderer:
 
                     elem.tail = " "
 
-    def replace_headers(self, text):
-
-        header_string = r"<heading_level_(?P<heading_level>\d)/>"
-        matches = re.finditer(header_string, text)
-
-        new_text = []
-        last_match_end = 0
-        for match in matches:
-            new_text.append(text[last_match_end : match.start()])
-            last_match_end = match.end()
-
-            match_dict = match.groupdict()
-            new_header = f'{"#" * int(match_dict["heading_level"])} '
-
-            new_text.append(new_header)
-
-        new_text.append(text[last_match_end:])
-        return "".join(new_text)
-
     def generate_heading_id(self, line):
         """Add a heading ID to each header.
 
@@ -396,7 +538,7 @@ class Renderer:
 
         # Get the non-parameter elements of the function signature. This can
         # include the return type, as well as the function's name.
-        name_elems = line.xpath("./span[not(contains(@class, 'param-list'))]")
+        name_elems = xpath(line, "./span[not(contains(@class, 'param-list'))]")
         id_string = []
         for elem in name_elems:
             if elem.text is not None:
@@ -416,7 +558,7 @@ class Renderer:
         # Get the list of parameter elements defined in this function/method
         # signature. We will need to use these to differentiate between
         # overloaded functions that share a name and return type.
-        param_list = line.xpath("./span[contains(@class, 'param-list')]")
+        param_list = xpath(line, "./span[contains(@class, 'param-list')]")
 
         if len(param_list):
             param_list = param_list[0]
@@ -476,28 +618,12 @@ class Renderer:
     #     # filter removes possible Nones in texts and tails
     #     return "".join(filter(None, parts))
 
-    def tidy_text(self, text):
-
-        text = re_sub(
-            r"&#8221;([\w -]+?)&#8221;",
-            r"&#8220;\1&#8221;",
-            text,
-        )
-
-        text = re_sub(
-            r"&#8216;([\w -]+?)&#8217;",
-            r"&#8220;\1&#8221;",
-            text,
-        )
-
-        text = re_sub(
-            r"<span class=\"default-val\">'([\w -]+?)'</span>",
-            r'<span class="default-val">"\1"</span>',
-            text,
-        )
-
-        return text
+    @staticmethod
+    def tidy_text(text):
+        """Put short phrases in curly or single quotes in double quotes."""
+        return QUOTED_PHRASE.sub(_double_quote, text)
 
+    @timed
     def parse_section(self, root):
         if type(root) is list:
             for elem in root:
@@ -525,32 +651,64 @@ class Renderer:
         if (root.text is None or root.text == "") and not list(root):
             return
 
-        with DocTree("div", opening_newline=True) as d:
-            node = Node("div", **d)
-            node.set("class", "api-docs")
+        d = RenderContext("div")
+        node = Node("div", context=d)
+        node.set("class", "api-docs")
 
-            with DocTree("h", **d) as d_h:
-                title_node = Node("h", section_title, **d_h)
-                title_node.set("class", "include-toc")
-                node.append(title_node)
+        d_h = d.enter("h")
+        title_node = Node("h", section_title, context=d_h)
+        title_node.set("class", "include-toc")
+        node.append(title_node)
 
-                # with DocTree(None, increment_heading=True, **d) as d_contents:
-                for child in root:
+        # with DocTree(None, increment_heading=True, **d) as d_contents:
+        for child in root:
+            with span("parse_tree", child):
+                if self.render_cache is None:
                     self.parse_tree(node, child, context=d_h)
+                else:
+                    self.parse_cached(node, child, section_id, context=d_h)
+
+        self.rendered_trees.append(node)
 
-                self.rendered_trees.append(node)
+    def parse_cached(self, parent, node, section_id, context=None):
+        """Parse a top-level object, unless its output is in the render cache.
+
+        The output of the object is preceded by a fragment marker, which is
+        replaced by the cached output (if any) once the section is serialized.
+        """
+        key = ""
+        if node.tag in self.CACHED_TAGS:
+            key = self.render_cache.key(
+                node,
+                self.document_root.get("api-lang"),
+                section_id,
+                context.heading_level,
+            )
+
+        marker = Node(FRAGMENT_TAG)
+        marker.set("key", key)
+        parent.append(marker)
+
+        if key and (text := self.render_cache.get(key)) is not None:
+            self.cached_fragments[key] = text
+            return
+
+        self.parse_tree(parent, node, context=context)
 
     def extract_tree(self, node, subfunction: str = None, context=None, **kwargs):
         tag = node.tag
 
-        if subfunction is not None:
-            tag = f"{tag}_{subfunction}"
+        if subfunction is None and (attr := self.SUBTYPE_ATTRS.get(tag)) is not None:
+            subfunction = node.get(attr, "NONE")
+
+        self.handler_calls[(tag, subfunction)] += 1
 
         if node.tail and not node.tail.isspace():
             if node.tag not in {"strong", "title_reference", "emphasis"}:
+                self.tail_warnings += 1
                 warnings.warn(
                     (
-                        f"The element {tag} contains a tail. No elements should have tails.\n"
+                        f"The element {self.__handler_name(tag, subfunction)} contains a tail. No elements should have tails.\n"
                         f"\tBase: {node.base}\n"
                         f"\tLine: {node.sourceline}\n"
                         f"\tTail text:\n\t\t{node.tail}"
@@ -558,9 +716,8 @@ class Renderer:
                     category=RuntimeWarning,
                 )
 
-        func_name = f"_parse_node_{tag}"
-        parse_func = self.__get_parse_func(func_name)
-        children = parse_func(node, context=context, **kwargs)
+        parse_func = self.__get_parse_func(tag, subfunction)
+        children = parse_func(self, node, context=context, **kwargs)
 
         if children is not None:
             if not children.text:
@@ -578,83 +735,135 @@ class Renderer:
         else:
             parent.append(children)
 
-    def __get_parse_func(self, func_name):
-        parse_func = getattr(self, func_name, None)
+    @classmethod
+    def dispatch_table(cls):
+        """Map each `(tag, subtype)` pair to the function that renders it.
 
-        if parse_func is not None:
+        The subtype is the value of the attribute named in `SUBTYPE_ATTRS` for
+        that tag (e.g. the `objtype` of a `desc`), or `None` for other tags.
+        The table is built once per class, from the `_parse_node_*` methods and
+        `BLOCK_CLASSES`.
+        """
+        if (table := cls.__dict__.get("_dispatch_table")) is not None:
+            return table
+
+        table = {}
+        for name in dir(cls):
+            if not name.startswith("_parse_node_"):
+                continue
+
+            func = getattr(cls, name)
+            suffix = name[len("_parse_node_") :]
+            table[(suffix, None)] = func
+
+            for tag in cls.SUBTYPE_ATTRS:
+                if suffix.startswith(f"{tag}_"):
+                    table[(tag, suffix[len(tag) + 1 :])] = func
+
+        for key, css_class in cls.BLOCK_CLASSES.items():
+            table[key] = partial(cls._parse_block, css_class=css_class)
+
+        cls._dispatch_table = table
+        return table
+
+    @staticmethod
+    def __handler_name(tag, subfunction):
+        if subfunction is None:
+            return tag
+        return f"{tag}_{subfunction}"
+
+    def __get_parse_func(self, tag, subfunction):
+        table = self.dispatch_table()
+
+        if (parse_func := table.get((tag, subfunction))) is not None:
             return parse_func
 
+        func_name = f"_parse_node_{self.__handler_name(tag, subfunction)}"
         warnings.warn(NotImplementedWarning(f"{func_name}"))
 
-        if func_name.startswith("_parse_content_"):
-            return lambda *args, **kwargs: ""
-        else:
-            return lambda *args, **kwargs: None
+        # Elements without a handler are skipped, and only reported once.
+        table[(tag, subfunction)] = _skip_node
+        return _skip_node
+
+    def is_implemented(self, tag, subfunction=None):
+        return (
+            self.dispatch_table().get((tag, subfunction), _skip_node) is not _skip_node
+        )
+
+    def _parse_block(self, node, css_class, context=None, **kwargs):
+        d = context.enter("div")
+        elem = Node("div", context=d)
+        elem.set("class", css_class)
+
+        for child in node:
+            if (extracted := self.extract_tree(child, context=d, **kwargs)) is not None:
+                elem.append(extracted)
+
+        return elem
 
     def _parse_node_strong(self, node, context=None, **kwargs):
-        with DocTree("strong", **context) as d:
-            elem = Node("strong", **d)
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            return parsed
+        d = context.enter("strong")
+        elem = Node("strong", context=d)
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        return parsed
 
     def _parse_node_emphasis(self, node, context=None, **kwargs):
-        with DocTree("em", **context) as d:
-            elem = Node("em", **d)
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            return parsed
+        d = context.enter("em")
+        elem = Node("em", context=d)
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        return parsed
 
     def _parse_node_title_reference(self, node, context=None, **kwargs):
-        with DocTree("span", **context) as d:
-            elem = Node("span", **d)
-            elem.set("class", "title-reference")
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            return parsed
+        d = context.enter("span")
+        elem = Node("span", context=d)
+        elem.set("class", "title-reference")
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        return parsed
 
     def _parse_node_paragraph(self, node, context=None, **kwargs):
-        with DocTree("p", **context) as d:
-            elem = Node("p", **d)  # E.p()
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            return parsed
+        d = context.enter("p")
+        elem = Node("p", context=d)  # E.p()
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        return parsed
 
     def _parse_node_return_value(self, node, context=None, **kwargs):
-        with DocTree("div", **context) as d:
-            wrapper = Node("div", **d)
-            wrapper.set("class", "returns")
-
-            with DocTree("h", **d) as d_h:
-                wrapper.append(Node("h", "Returns", **d_h))
-
-            return_type_elem_orig = node.getparent().find("return_type")
-            if return_type_elem_orig is not None:
-                return_type_elem = deepcopy(return_type_elem_orig)
-                return_type_elem_orig.getparent().remove(return_type_elem_orig)
-
-                type_elem = Node("span", **d)
-                type_elem.set("class", "return_type")
-                type_elem = self.parse_content(
-                    type_elem, return_type_elem, context=d, **kwargs
-                )
+        d = context.enter("div")
+        wrapper = Node("div", context=d)
+        wrapper.set("class", "returns")
 
-                type_elem = self.unnest_content(
-                    type_elem,
-                    unnest_elems={"p", "literal"},
-                    **kwargs,
-                )
+        d_h = d.enter("h")
+        wrapper.append(Node("h", "Returns", context=d_h))
+
+        return_type_elem = node.getparent().find("return_type")
+        if return_type_elem is not None:
+            return_type_elem.getparent().remove(return_type_elem)
+
+            type_elem = Node("span", context=d)
+            type_elem.set("class", "return_type")
+            type_elem = self.parse_content(
+                type_elem, return_type_elem, context=d, **kwargs
+            )
 
-                stripped_lines = []
-                for line in type_elem.text:
-                    stripped_lines.append(line.strip(" ."))
+            type_elem = self.unnest_content(
+                type_elem,
+                unnest_elems={"p", "literal"},
+                **kwargs,
+            )
 
-                type_elem.text = stripped_lines
+            stripped_lines = []
+            for line in type_elem.text:
+                stripped_lines.append(line.strip(" ."))
 
-                wrapper.append(type_elem)
+            type_elem.text = stripped_lines
 
-            elem = Node("span", **d)  # E.p()
-            elem.set("class", "return_value")
-            wrapper.append(elem)
-            elem = self.parse_content(elem, node, context=d, **kwargs)
+            wrapper.append(type_elem)
 
-            return wrapper
+        elem = Node("span", context=d)  # E.p()
+        elem.set("class", "return_value")
+        wrapper.append(elem)
+        elem = self.parse_content(elem, node, context=d, **kwargs)
+
+        return wrapper
 
     def _parse_node_return_type(self, node, context=None, **kwargs):
         # Do nothing, because the `return_type` tag is also handled by the
@@ -663,106 +872,53 @@ class Renderer:
 
     # def _parse_node_return_type(self, node, context=None, **kwargs):
     #     with DocTree("span", classes="return_type", **context) as d:
-    #         elem = Node("span", **d)  # E.p()
+    #         elem = Node("span", context=d)  # E.p()
     #         parsed = self.parse_content(elem, node, context=d, **kwargs)
     #         return parsed
 
     def _parse_node_block_quote(self, node, context=None, **kwargs):
-        with DocTree("blockquote", **context) as d:
-            elem = Node("blockquote", **d)  # E.p()
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            return parsed
+        d = context.enter("blockquote")
+        elem = Node("blockquote", context=d)  # E.p()
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        return parsed
 
     def _parse_node_enumerated_list(self, node, context=None, **kwargs):
-        with DocTree("ol", **context) as d:
-            elem = Node("ol", **d)  # E.ol()
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            # indented = parsed.indent()
-            return parsed
+        d = context.enter("ol")
+        elem = Node("ol", context=d)  # E.ol()
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        # indented = parsed.indent()
+        return parsed
 
     def _parse_node_bullet_list(self, node, context=None, **kwargs):
-        with DocTree("ul", **context) as d:
-            elem = Node("ul", **d)  # E.ol()
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            # indented = parsed.indent()
-            return parsed
+        d = context.enter("ul")
+        elem = Node("ul", context=d)  # E.ol()
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        # indented = parsed.indent()
+        return parsed
 
     def _parse_node_list_item(self, node, context=None, **kwargs):
-        with DocTree("li", **context) as d:
-            elem = Node("li", **d)  # E.li()
-            elem = self.parse_content(elem, node, context=d, **kwargs)
-            # print(type(elem))
-            # print(elem.tag)
-            return self.unnest_content(elem, **kwargs)
-
-    def _parse_node_desc(self, node, context=None, **kwargs):
-        objtype = node.get("objtype", "NONE")
-        return self.extract_tree(node, subfunction=objtype, context=context, **kwargs)
-
-    def _parse_node_definition_list(self, node, context=None, **kwargs):
-        objtype = node.get("content-type", "NONE")
-        return self.extract_tree(node, subfunction=objtype, context=context, **kwargs)
-
-    def _parse_node_desc_class(self, node, context=None, **kwargs):
-        with DocTree("div", **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "class")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
-
-    def _parse_node_func_context(self, node, context=None, **kwargs):
-        with DocTree("div", **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "context")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
+        d = context.enter("li")
+        elem = Node("li", context=d)  # E.li()
+        elem = self.parse_content(elem, node, context=d, **kwargs)
+        # print(type(elem))
+        # print(elem.tag)
+        return self.unnest_content(elem, **kwargs)
 
     def _parse_node_desc_context(self, node, context=None, **kwargs):
-        with DocTree(
-            "h", indent_children=False, increment_heading=True, **context
-        ) as d:
-            elem = Node(
-                "h", indent_children=False, increment_heading=True, **d
-            )  # E.ol()
-            elem.set("class", "context-name")
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            # indented = parsed.indent()
-            return parsed
+        d = context.enter("h")
+        elem = Node("h", context=d)  # E.ol()
+        elem.set("class", "context-name")
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        # indented = parsed.indent()
+        return parsed
 
     def _parse_node_desc_signature(self, node, context=None, **kwargs):
         sig_type = node.get("sig-type", None)
         if sig_type is not None:
             if sig_type == "enumerator":
-                with DocTree("span", **context) as d:
-                    node_wrapper = Node("span", **d)  # E.span()
-                    node_wrapper.set("class", "enum-signature")
-
-                    for item in node:
-                        if (
-                            extracted := self.extract_tree(item, context=d, **kwargs)
-                        ) is not None:
-                            node_wrapper.append(extracted)
-
-                return node_wrapper
-
-        else:
-            with DocTree(
-                "h", indent_children=False, increment_heading=True, **context
-            ) as d:
-                node_wrapper = Node("h", **d)  # E.span()
-                node_wrapper.set("class", "signature include-toc")
+                d = context.enter("span")
+                node_wrapper = Node("span", context=d)  # E.span()
+                node_wrapper.set("class", "enum-signature")
 
                 for item in node:
                     if (
@@ -770,6 +926,19 @@ class Renderer:
                     ) is not None:
                         node_wrapper.append(extracted)
 
+                return node_wrapper
+
+        else:
+            d = context.enter("h")
+            node_wrapper = Node("h", context=d)  # E.span()
+            node_wrapper.set("class", "signature include-toc")
+
+            for item in node:
+                if (
+                    extracted := self.extract_tree(item, context=d, **kwargs)
+                ) is not None:
+                    node_wrapper.append(extracted)
+
             return node_wrapper
 
     def _parse_node_desc_annotation(self, node, context=None, **kwargs):
@@ -799,36 +968,36 @@ class Renderer:
         return self.parse_content(node_wrapper, node, context=context, **kwargs)
 
     def _parse_node_desc_content(self, node, context=None, **kwargs):
-        with DocTree("div", increment_heading=True, **context) as d:
-            # ugly_dump(node)
-            elem = Node("div", **d)
-            elem.set("class", "body")
-            return self.parse_content(elem, node, context=d, **kwargs)
+        d = context.enter("div", increment_heading=True)
+        # ugly_dump(node)
+        elem = Node("div", context=d)
+        elem.set("class", "body")
+        return self.parse_content(elem, node, context=d, **kwargs)
         # all_elems = []
-        # with DocTree("div", **context) as d:
-        #     description_wrapper = Node("div", **d)  # E.span()
-        #     description_wrapper.set("class", "description")
-
-        #     for item in node.xpath("./desc/preceding-sibling::paragraph"):
-        #         with DocTree("p", **d) as d_p:
-        #             p_node = Node("p", **d_p)
-        #             description_wrapper.append(
-        #                 self.parse_content(p_node, item, context=d_p, **kwargs)
-        #             )
-
-        #     all_elems.append(description_wrapper)
-
-        # with DocTree("div", **context) as d:
-        #     methods_wrapper = Node("div", **d)
-        #     methods_wrapper.set("class", "body")
-
-        #     for item in node.xpath("./*[not(name()='paragraph')]"):
-        #         all_elems.append(
-        #             self.parse_content(methods_wrapper, item, context=d, **kwargs)
-        #         )
+        # d = context.enter("div")
+        # description_wrapper = Node("div", context=d)  # E.span()
+        # description_wrapper.set("class", "description")
+
+        # for item in node.xpath("./desc/preceding-sibling::paragraph"):
+        #     d_p = d.enter("p")
+        #     p_node = Node("p", context=d_p)
+        #     description_wrapper.append(
+        #         self.parse_content(p_node, item, context=d_p, **kwargs)
+        #     )
+
+        # all_elems.append(description_wrapper)
+
+        # d = context.enter("div")
+        # methods_wrapper = Node("div", context=d)
+        # methods_wrapper.set("class", "body")
+
+        # for item in node.xpath("./*[not(name()='paragraph')]"):
+        #     all_elems.append(
+        #         self.parse_content(methods_wrapper, item, context=d, **kwargs)
+        #     )
         # with DocTree("")
 
-        # with DocTree("div", **context) as d:
+        # d = context.enter("div")
 
         # if (
         #     extracted := self.extract_tree(item, context=d, **kwargs)
@@ -837,134 +1006,53 @@ class Renderer:
 
         # return all_elems
 
-    def _parse_node_desc_function(self, node, context=None, **kwargs):
-        return self._parse_node_desc_method(node, context=context, **kwargs)
-
-    def _parse_node_desc_method(self, node, context=None, **kwargs):
-        with DocTree("div", increase_heading=True, **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "method")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
-
-    def _parse_node_desc_var(self, node, context=None, **kwargs):
-        with DocTree("div", increase_heading=True, **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "struct-var")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
-
-    def _parse_node_desc_struct(self, node, context=None, **kwargs):
-        with DocTree("div", increase_heading=True, **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "struct")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
-
-    def _parse_node_desc_enum(self, node, context=None, **kwargs):
-        with DocTree("div", increase_heading=True, **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "enum")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
-
-    def _parse_node_desc_enumerator(self, node, context=None, **kwargs):
-        with DocTree("div", increase_heading=True, **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "enum-value")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
-
-    def _parse_node_desc_attribute(self, node, context=None, **kwargs):
-        with DocTree("div", increase_heading=True, **context) as d:
-            elem = Node("div", **d)  # E.div()
-            elem.set("class", "attribute")
-
-            for child in node:
-                if (
-                    extracted := self.extract_tree(child, context=d, **kwargs)
-                ) is not None:
-                    elem.append(extracted)
-
-            return elem
-
     def _parse_node_desc_returns(self, node, context=None, **kwargs):
-        with DocTree("span", **context) as d:
-            node_wrapper = Node("span", **d)  # E.span()
-            node_wrapper.set("class", "returns")
+        d = context.enter("span")
+        node_wrapper = Node("span", context=d)  # E.span()
+        node_wrapper.set("class", "returns")
 
-            return self.parse_content(node_wrapper, node, context=context, **kwargs)
+        return self.parse_content(node_wrapper, node, context=context, **kwargs)
 
     def _parse_node_desc_ref(self, node, context=None, **kwargs):
-        with DocTree("span", **context) as d:
-            node_wrapper = Node("span", **d)  # E.span()
-            node_wrapper.set("class", "pointer-ref")
+        d = context.enter("span")
+        node_wrapper = Node("span", context=d)  # E.span()
+        node_wrapper.set("class", "pointer-ref")
 
-            return self.parse_content(node_wrapper, node, context=context, **kwargs)
+        return self.parse_content(node_wrapper, node, context=context, **kwargs)
 
     def _parse_node_desc_parameterlist(self, node, context=None, **kwargs):
-        with DocTree("span", **context) as d:
-            node_wrapper = Node("span", **d)  # E.span()
-            node_wrapper.set("class", "param-list")
-            node_wrapper.text += "("
+        d = context.enter("span")
+        node_wrapper = Node("span", context=d)  # E.span()
+        node_wrapper.set("class", "param-list")
+        node_wrapper.text += "("
 
-            parsed = self.parse_content(node_wrapper, node, context=context, **kwargs)
-            # parsed._content[-1].tail += ")"
-            return parsed
+        parsed = self.parse_content(node_wrapper, node, context=context, **kwargs)
+        # parsed._content[-1].tail += ")"
+        return parsed
 
     def _parse_node_desc_parameter(self, node, context=None, **kwargs):
-        with DocTree("span", **context) as d:
-            node_wrapper = Node("span", **d)  # E.span()
-            node_wrapper.set("class", "param")
+        d = context.enter("span")
+        node_wrapper = Node("span", context=d)  # E.span()
+        node_wrapper.set("class", "param")
 
-            parsed = self.parse_content(node_wrapper, node, context=context, **kwargs)
-            return parsed
+        parsed = self.parse_content(node_wrapper, node, context=context, **kwargs)
+        return parsed
 
     def _parse_node_desc_type(self, node, context=None, **kwargs):
-        with DocTree("span", **context) as d:
-            node_wrapper = Node("span", **d)  # E.span()
-            node_wrapper.set("class", "type")
+        d = context.enter("span")
+        node_wrapper = Node("span", context=d)  # E.span()
+        node_wrapper.set("class", "type")
 
-            parsed = self.parse_content(node_wrapper, node, context=context, **kwargs)
-            return parsed
+        parsed = self.parse_content(node_wrapper, node, context=context, **kwargs)
+        return parsed
 
     def _parse_node_func_description(self, node, context=None, **kwargs):
-        with DocTree("div", **context) as d:
-            elem = Node("div", **d)  # E.ol()
-            elem.set("class", "description")
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
-            # indented = parsed.indent()
-            return parsed
+        d = context.enter("div")
+        elem = Node("div", context=d)  # E.ol()
+        elem.set("class", "description")
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
+        # indented = parsed.indent()
+        return parsed
 
     def _parse_node_struct_description(self, node, context=None, **kwargs):
         return self._parse_node_func_description(node, context=context, **kwargs)
@@ -974,57 +1062,55 @@ class Renderer:
             if child.text and child.text == "Values:":
                 node.remove(child)
 
-        with DocTree("div", **context) as d:
-            elem = Node("div", **d)  # E.ol()
-            elem.set("class", "description")
-            parsed = self.parse_content(elem, node, context=d, **kwargs)
+        d = context.enter("div")
+        elem = Node("div", context=d)  # E.ol()
+        elem.set("class", "description")
+        parsed = self.parse_content(elem, node, context=d, **kwargs)
 
-            return parsed
+        return parsed
 
     def _parse_node_definition_list_parameters(self, node, context=None, **kwargs):
-        with DocTree("div", **context) as d:
-            node_wrapper = Node("div", **d)  # E.span()
-            node_wrapper.set("class", "parameters")
+        d = context.enter("div")
+        node_wrapper = Node("div", context=d)  # E.span()
+        node_wrapper.set("class", "parameters")
 
-            with DocTree("h", increment_heading=True, **d) as d_h:
-                node_wrapper.append(Node("h", "Parameters", **d_h))
+        d_h = d.enter("h")
+        node_wrapper.append(Node("h", "Parameters", context=d_h))
 
-            with DocTree("ul", **d) as d_ol:
-                ol = Node("ul", **d_ol)
-                parsed = self.parse_content(ol, node, context=d_ol, **kwargs)
-                node_wrapper.append(parsed)
-                # parsed._content[-1].tail += ")"
+        d_ol = d.enter("ul")
+        ol = Node("ul", context=d_ol)
+        parsed = self.parse_content(ol, node, context=d_ol, **kwargs)
+        node_wrapper.append(parsed)
+        # parsed._content[-1].tail += ")"
 
         return node_wrapper
 
     def _parse_node_definition_list_NONE(self, node, context=None, **kwargs):
-        with DocTree("div", **context) as d:
-            node_wrapper = Node("div", **d)  # E.span()
-            # node_wrapper.set("class", "parameters")
+        d = context.enter("div")
+        node_wrapper = Node("div", context=d)  # E.span()
+        # node_wrapper.set("class", "parameters")
 
-            # with DocTree("h", increment_heading=True, **d) as d_h:
-            #     node_wrapper.append(Node("h", "Parameters", **d_h))
+        # d_h = d.enter("h")
+        # node_wrapper.append(Node("h", "Parameters", context=d_h))
 
-            with DocTree("ul", **d) as d_ol:
-                ol = Node("ul", **d_ol)
-                parsed = self.parse_content(ol, node, context=d_ol, **kwargs)
-                node_wrapper.append(parsed)
-                # parsed._content[-1].tail += ")"
+        d_ol = d.enter("ul")
+        ol = Node("ul", context=d_ol)
+        parsed = self.parse_content(ol, node, context=d_ol, **kwargs)
+        node_wrapper.append(parsed)
+        # parsed._content[-1].tail += ")"
 
         return node_wrapper
 
     # def _parse_node_defin
 
     def _parse_node_param(self, node, context=None, **kwargs):
-        with DocTree("li", **context) as d:
-            node_wrapper = Node("li", **d)  # E.span()
-            node_wrapper.set("class", "param-item")
+        d = context.enter("li")
+        node_wrapper = Node("li", context=d)  # E.span()
+        node_wrapper.set("class", "param-item")
 
-            for item in node:
-                if (
-                    extracted := self.extract_tree(item, context=d, **kwargs)
-                ) is not None:
-                    node_wrapper.append(extracted)
+        for item in node:
+            if (extracted := self.extract_tree(item, context=d, **kwargs)) is not None:
+                node_wrapper.append(extracted)
 
         return node_wrapper
 
@@ -1053,31 +1139,29 @@ class Renderer:
         return self.parse_content(node_wrapper, node, context=context, **kwargs)
 
     def _parse_node_definition_list_exceptions(self, node, context=None, **kwargs):
-        with DocTree("div", **context) as d:
-            node_wrapper = Node("div", **d)  # E.span()
-            node_wrapper.set("class", "exceptions")
+        d = context.enter("div")
+        node_wrapper = Node("div", context=d)  # E.span()
+        node_wrapper.set("class", "exceptions")
 
-            with DocTree("h", increment_heading=True, **d) as d_h:
-                node_wrapper.append(Node("h", "Exceptions", **d_h))
+        d_h = d.enter("h")
+        node_wrapper.append(Node("h", "Exceptions", context=d_h))
 
-            with DocTree("ul", **d) as d_ol:
-                ol = Node("ul", **d_ol)
-                parsed = self.parse_content(ol, node, context=d_ol, **kwargs)
-                node_wrapper.append(parsed)
-                # parsed._content[-1].tail += ")"
+        d_ol = d.enter("ul")
+        ol = Node("ul", context=d_ol)
+        parsed = self.parse_content(ol, node, context=d_ol, **kwargs)
+        node_wrapper.append(parsed)
+        # parsed._content[-1].tail += ")"
 
         return node_wrapper
 
     def _parse_node_exception(self, node, context=None, **kwargs):
-        with DocTree("li", **context) as d:
-            node_wrapper = Node("li", **d)  # E.span()
-            node_wrapper.set("class", "exc-item")
+        d = context.enter("li")
+        node_wrapper = Node("li", context=d)  # E.span()
+        node_wrapper.set("class", "exc-item")
 
-            for item in node:
-                if (
-                    extracted := self.extract_tree(item, context=d, **kwargs)
-                ) is not None:
-                    node_wrapper.append(extracted)
+        for item in node:
+            if (extracted := self.extract_tree(item, context=d, **kwargs)) is not None:
+                node_wrapper.append(extracted)
 
         return node_wrapper
 
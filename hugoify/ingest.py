@@ -0,0 +1,28 @@
+from lxml import etree
+
+from .instrument import phase
+
+REMOVE_ATTRS = [
+    "noemph",
+    "{*}space",
+    "add_permalink",
+    "is_multiline",
+    "noindex",
+]
+
+
+def load_document(path):
+    """Load a generated `*_api.xml` file, stripping attributes we don't use."""
+    with phase("load"):
+        tree = etree.parse(
+            str(path), parser=etree.XMLParser(recover=True, remove_comments=True)
+        )
+        root = tree.getroot()
+
+    with phase("strip_attributes"):
+        etree.strip_attributes(
+            root,
+            *REMOVE_ATTRS,
+        )
+
+    return root
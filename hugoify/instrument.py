@@ -0,0 +1,262 @@
+import os
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+
+# The profile of the file being converted, if instrumentation is enabled.
+_current = None
+
+_untimed = nullcontext()
+
+
+class FileProfile:
+    """The time and memory spent in each phase of converting one file.
+
+    Each phase maps to `[wall seconds, CPU seconds, memory delta, calls]`,
+    where the memory delta is the net change in the memory traced by
+    `tracemalloc`, in bytes. It's negative for a phase that frees more memory
+    than it allocates, so it isn't the peak memory used by the phase.
+    A phase that is entered again while it's already running (e.g. by a
+    recursive call) is only counted once.
+
+    If `trace` is true, every phase and span is also kept as a Chrome trace
+    event in `events`.
+    """
+
+    def __init__(self, name, trace=False):
+        self.name = name
+        self.phases = {}
+        self.total = [0.0, 0.0, 0, 1]
+        self.events = [] if trace else None
+        self._active = set()
+
+    @contextmanager
+    def phase(self, name):
+        if name in self._active:
+            yield
+            return
+
+        self._active.add(name)
+        start = _sample()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+
+            end = _sample()
+            stats = self.phases.setdefault(name, [0.0, 0.0, 0, 0])
+            for ix, val in enumerate(end):
+                stats[ix] += val - start[ix]
+            stats[3] += 1
+
+            if self.events is not None:
+                self.add_event(name, "phase", start[0], end[0])
+
+    @contextmanager
+    def span(self, category, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_event(name, category, start, time.perf_counter())
+
+    def add_event(self, name, category, start, end, **args):
+        """Add a complete ("X") trace event, with times in seconds."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start * 1e6, 3),
+            "dur": round((end - start) * 1e6, 3),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+
+        self.events.append(event)
+
+
+def _sample():
+    import tracemalloc
+
+    return (
+        time.perf_counter(),
+        time.process_time(),
+        tracemalloc.get_traced_memory()[0],
+    )
+
+
+def phase(name):
+    """Time the code in a `with` block as the phase `name`."""
+    if _current is None:
+        return _untimed
+
+    return _current.phase(name)
+
+
+def span(category, elem):
+    """Trace the code in a `with` block as a span for the API object `elem`.
+
+    Spans only appear in the trace, and aren't counted as phases.
+    """
+    if _current is None or _current.events is None:
+        return _untimed
+
+    return _current.span(category, describe(elem))
+
+
+def describe(elem):
+    """Return a readable name for the API object `elem`, to label its span."""
+    if (signature := elem.find("desc_signature")) is not None:
+        if ids := signature.get("ids"):
+            return ids.split()[0]
+
+        if (name := signature.find(".//desc_name")) is not None and name.text:
+            return name.text.strip()
+
+    if objtype := elem.get("objtype"):
+        return f"{elem.tag}[{objtype}]"
+
+    return elem.get("id") or elem.tag
+
+
+def traced(func):
+    """Trace every call to `func` on a single API object as a span.
+
+    `func` should be a method that takes an element (or a list of them) as its
+    first argument.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self, elem, *args, **kwargs):
+        if _current is None or _current.events is None or type(elem) is list:
+            return func(self, elem, *args, **kwargs)
+
+        with _current.span(name, describe(elem)):
+            return func(self, elem, *args, **kwargs)
+
+    return wrapper
+
+
+def timed(func):
+    """Time every call to `func` as a phase named after it."""
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current is None:
+            return func(*args, **kwargs)
+
+        with _current.phase(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def profile_file(path, profile=False, profile_dir=None, trace=False):
+    """Record the phases of converting `path`, yielding its `FileProfile`.
+
+    If `profile_dir` is given, the conversion is also run under `cProfile`, and
+    the stats are saved to `{profile_dir}/{stem}.prof`. If `trace` is true,
+    trace events are kept for every phase and API object. Memory is only traced
+    if `profile` is true, and nothing is recorded (and `None` is yielded) if
+    all of them are unset.
+    """
+    global _current
+
+    if not (profile or profile_dir or trace):
+        yield None
+        return
+
+    # These are only imported when they're needed, to keep startup fast.
+    import cProfile
+    import tracemalloc
+
+    started_tracing = profile and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    profiler = None
+    if profile_dir is not None:
+        profiler = cProfile.Profile()
+
+    _current = file_profile = FileProfile(Path(path).name, trace=trace)
+    start = _sample()
+    if profiler is not None:
+        profiler.enable()
+
+    try:
+        yield file_profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+
+        end = _sample()
+        file_profile.total[:3] = [b - a for a, b in zip(start, end)]
+        if trace:
+            file_profile.add_event(file_profile.name, "file", start[0], end[0])
+        _current = None
+
+        if started_tracing:
+            tracemalloc.stop()
+
+        if profiler is not None:
+            Path(profile_dir).mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(Path(profile_dir) / f"{Path(path).stem}.prof"))
+
+
+def write_trace(path, events):
+    """Write `events` to `path` in the Chrome trace event format.
+
+    The file can be opened in `chrome://tracing` or the Perfetto UI.
+    """
+    import json
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.open("w") as fp:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fp)
+        fp.write("\n")
+
+
+def format_summary(profiles, limit=10):
+    """Summarize the slowest files and phases of `profiles` as a table."""
+    profiles = sorted(profiles, key=lambda _: _.total[0], reverse=True)
+
+    lines = [
+        f"Slowest files (of {len(profiles)}):",
+        _format_row("file", "wall", "cpu", "Δmem", "calls"),
+    ]
+    for profile in profiles[:limit]:
+        lines.append(_format_row(profile.name, *profile.total))
+
+    phases = {}
+    for profile in profiles:
+        for name, stats in profile.phases.items():
+            totals = phases.setdefault(name, [0.0, 0.0, 0, 0])
+            for ix, val in enumerate(stats):
+                totals[ix] += val
+
+    lines.append("")
+    lines.append("Slowest phases (summed over all files):")
+    lines.append(_format_row("phase", "wall", "cpu", "Δmem", "calls"))
+    for name, stats in sorted(phases.items(), key=lambda _: _[1][0], reverse=True):
+        lines.append(_format_row(name, *stats))
+
+    return "\n".join(lines)
+
+
+def _format_row(name, wall, cpu, mem_delta, calls):
+    if isinstance(wall, str):
+        return f"  {name:<32} {wall:>10} {cpu:>10} {mem_delta:>12} {calls:>8}"
+
+    return (
+        f"  {name:<32} {wall:>9.3f}s {cpu:>9.3f}s "
+        f"{mem_delta / 1024:>+9.0f} kB {calls:>8}"
+    )
@@ -0,0 +1,104 @@
+import os, sys
+import io
+from contextlib import redirect_stdout, redirect_stderr
+from functools import partial
+
+
+class JobResult:
+    def __init__(self, item, log="", error=None, value=None):
+        self.item = item
+        self.log = log
+        self.error = error
+        self.value = value
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+
+def get_job_count(value=None):
+    """Convert the value of the `jobs` input into a worker count.
+
+    An empty value defaults to a single worker, while `0` or `auto` will use one
+    worker per available CPU.
+    """
+    if value is None or str(value).strip() == "":
+        return 1
+
+    value = str(value).strip().lower()
+    if value in ("0", "auto"):
+        return os.cpu_count() or 1
+
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid number of jobs: {value}")
+
+    if jobs < 0:
+        raise ValueError(f"Invalid number of jobs: {value}")
+
+    return jobs
+
+
+def _run_job(func, args, kwargs, item):
+    # Capture everything the job prints, so that the output of jobs running in
+    # parallel can be replayed in a deterministic order by the parent process.
+    log = io.StringIO()
+    error = None
+    value = None
+
+    with redirect_stdout(log), redirect_stderr(log):
+        try:
+            value = func(item, *args, **kwargs)
+        except Exception:
+            import traceback
+
+            error = traceback.format_exc()
+
+    return JobResult(item, log.getvalue(), error, value)
+
+
+def run_jobs(func, items, *args, jobs=1, **kwargs):
+    """Call `func(item, *args, **kwargs)` for every item, in input order.
+
+    The value returned by `func` is stored in the `JobResult` for its item.
+    If `jobs` is greater than one, the items are distributed across a pool of
+    worker processes. Exceptions raised by `func` are caught and stored in the
+    corresponding `JobResult`, so one bad input doesn't abort the whole run.
+    """
+    items = list(items)
+    run = partial(_run_job, func, args, kwargs)
+
+    if jobs <= 1 or len(items) <= 1:
+        for item in items:
+            yield run(item)
+        return
+
+    # Only imported when it's needed, since it's slow to import.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(items))) as executor:
+        yield from executor.map(run, items)
+
+
+def report_results(results):
+    """Print the output of each job as it finishes, returning all the results."""
+    reported = []
+
+    for result in results:
+        print(result.log, end="")
+        reported.append(result)
+
+    return reported
+
+
+def report_failures(results):
+    failed = [_ for _ in results if _.failed]
+
+    if failed:
+        print(f"Failed to process {len(failed)} file(s):", file=sys.stderr)
+        for result in failed:
+            print(f"  - {result.item}", file=sys.stderr)
+            print(result.error, file=sys.stderr)
+
+    return failed
@@ -0,0 +1,105 @@
+import os
+from functools import lru_cache
+from hashlib import sha256
+from pathlib import Path
+
+from lxml import etree
+
+from .cache import atomic_write, get_version
+
+PWD = (Path(__file__).resolve()).parent
+
+# The default size limit of the cache, in bytes.
+DEFAULT_MAX_BYTES = 64 << 20
+
+# The modules whose code decides how an object is rendered.
+RENDERER_MODULES = ("htmlify.py", "parser_utils.py")
+
+
+@lru_cache(maxsize=None)
+def get_renderer_fingerprint():
+    """Identify the version of the renderer that produced a cached fragment.
+
+    Besides the installed version, the source of the rendering modules is
+    hashed, so a development checkout doesn't reuse fragments rendered by
+    older code.
+    """
+    digest = sha256(get_version().encode("utf-8"))
+    for name in RENDERER_MODULES:
+        digest.update((PWD / name).read_bytes())
+
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """A persistent cache of the Markdown rendered for each API object.
+
+    Fragments are stored in `directory`, one file per object, and are keyed by
+    a canonical (C14N) hash of the object's subtree in the processed document,
+    along with the renderer's fingerprint and the context it's rendered in.
+    Using a fragment marks it as recently used, and `evict` removes the least
+    recently used ones once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, elem, *context):
+        digest = sha256(get_renderer_fingerprint().encode("utf-8"))
+        for val in context:
+            digest.update(f"{val}\0".encode("utf-8"))
+
+        digest.update(etree.tostring(elem, method="c14n"))
+        digest.update((elem.tail or "").encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def path(self, key):
+        return self.directory / key[:2] / f"{key}.html"
+
+    def get(self, key):
+        """Return the fragment cached for `key`, or `None` if there isn't one."""
+        path = self.path(key)
+
+        try:
+            text = path.read_text("utf-8")
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        atomic_write(self.path(key), text.encode("utf-8"))
+
+    def evict(self):
+        """Remove the least recently used fragments until the cache fits.
+
+        Returns the number of fragments that were removed.
+        """
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.html"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        return removed
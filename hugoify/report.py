@@ -0,0 +1,144 @@
+import copy
+from collections import Counter
+from pathlib import Path
+
+# The number of `deepcopy` calls since the last call to `reset_deepcopies`.
+_deepcopies = 0
+
+
+def deepcopy(obj):
+    """Call `copy.deepcopy`, counting the calls for the run report."""
+    global _deepcopies
+    _deepcopies += 1
+
+    return copy.deepcopy(obj)
+
+
+def reset_deepcopies():
+    global _deepcopies
+    _deepcopies = 0
+
+
+def get_deepcopies():
+    return _deepcopies
+
+
+class FileReport:
+    """Counters describing the conversion of one input file."""
+
+    def __init__(self, path):
+        path = Path(path)
+
+        self.file = path.name
+        self.input_bytes = path.stat().st_size
+        self.output_bytes = 0
+        self.rewritten = False
+        self.seconds = 0.0
+        self.elements = {}
+        self.deepcopies = 0
+        self.handlers = {}
+        self.not_implemented = {}
+        self.tail_warnings = 0
+        self.render_cache_hits = 0
+        self.render_cache_misses = 0
+
+        # The `FileProfile` of the file, if profiling or tracing is enabled.
+        self.profile = None
+
+    def count_elements(self, root):
+        counts = Counter(_.tag for _ in root.iter() if isinstance(_.tag, str))
+        self.elements = dict(sorted(counts.items()))
+
+    def add_renderer(self, renderer):
+        """Copy the handler counts and warnings collected by `renderer`."""
+        self.output_bytes = renderer.rendered_file.stat().st_size
+        self.rewritten = renderer.rewritten
+        self.tail_warnings = renderer.tail_warnings
+
+        if renderer.render_cache is not None:
+            self.render_cache_hits = renderer.render_cache.hits
+            self.render_cache_misses = renderer.render_cache.misses
+
+        for (tag, subtype), calls in sorted(
+            renderer.handler_calls.items(), key=lambda _: (_[0][0], _[0][1] or "")
+        ):
+            name = tag if subtype is None else f"{tag}_{subtype}"
+
+            if renderer.is_implemented(tag, subtype):
+                self.handlers[f"_parse_node_{name}"] = calls
+            else:
+                self.not_implemented[name] = calls
+
+    def to_dict(self):
+        return {
+            "file": self.file,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "rewritten": self.rewritten,
+            "seconds": round(self.seconds, 6),
+            "elements": self.elements,
+            "deepcopies": self.deepcopies,
+            "handlers": self.handlers,
+            "not_implemented": self.not_implemented,
+            "tail_warnings": self.tail_warnings,
+            "render_cache_hits": self.render_cache_hits,
+            "render_cache_misses": self.render_cache_misses,
+        }
+
+
+# The counters of each file that are summed up in the totals of a report.
+SUMMED_COUNTERS = (
+    "input_bytes",
+    "output_bytes",
+    "rewritten",
+    "seconds",
+    "deepcopies",
+    "tail_warnings",
+    "render_cache_hits",
+    "render_cache_misses",
+)
+
+
+def write_report(path, reports, failed=()):
+    """Write the reports of a run, and the names of the failed files, as JSON."""
+    _write_report(path, [_.to_dict() for _ in reports], [Path(_).name for _ in failed])
+
+
+def merge_reports(path, sources):
+    """Combine the JSON reports of several runs into a single report."""
+    import json
+
+    files = []
+    failed = []
+    for source in sources:
+        with open(source) as fp:
+            data = json.load(fp)
+
+        files.extend(data["files"])
+        failed.extend(data["failed"])
+
+    _write_report(path, files, failed)
+
+
+def _write_report(path, files, failed):
+    import json
+
+    files = sorted(files, key=lambda _: _["file"])
+
+    totals = {"files": len(files), "failed": len(failed)}
+    for name in SUMMED_COUNTERS:
+        totals[name] = sum(_[name] for _ in files)
+    totals["seconds"] = round(totals["seconds"], 6)
+
+    data = {
+        "totals": totals,
+        "files": files,
+        "failed": sorted(failed),
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.open("w") as fp:
+        json.dump(data, fp, indent=2)
+        fp.write("\n")
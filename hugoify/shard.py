@@ -0,0 +1,130 @@
+from pathlib import Path
+
+from .cache import BuildManifest, write_if_changed
+from .report import merge_reports
+
+
+def parse_shard(value):
+    """Parse a shard given as `INDEX/COUNT`, e.g. `2/4`, into a tuple.
+
+    Shards are numbered from 1 to `COUNT`.
+    """
+    try:
+        index, count = (int(_) for _ in str(value).split("/"))
+    except ValueError:
+        raise ValueError(f"expected INDEX/COUNT, got {value!r}") from None
+
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard {index} of {count} doesn't exist")
+
+    return index, count
+
+
+def assign_shards(input_files, count):
+    """Partition `input_files` into `count` shards of roughly equal total size.
+
+    The largest files are assigned first, each to the shard with the least work
+    so far. Ties are broken by name and shard index, so every job computes the
+    same partition of the same files.
+    """
+    sized_files = sorted(
+        ((Path(_).stat().st_size, Path(_)) for _ in input_files),
+        key=lambda _: (-_[0], _[1].name),
+    )
+
+    shards = [[] for _ in range(count)]
+    totals = [0] * count
+    for size, f in sized_files:
+        smallest = min(range(count), key=lambda _: (totals[_], _))
+        shards[smallest].append(f)
+        totals[smallest] += size
+
+    return [sorted(_) for _ in shards]
+
+
+def select_shard(input_files, shard):
+    """Return the input files converted by `shard`, an `(INDEX, COUNT)` tuple."""
+    if shard is None:
+        return list(input_files)
+
+    index, count = shard
+    return assign_shards(input_files, count)[index - 1]
+
+
+def merge_shards(sources, output_dir, report=None):
+    """Combine the output of sharded runs into one output tree.
+
+    `sources` are the output directories of the shards, along with their run
+    reports (`.json` files), which are merged into `report`. The rendered files
+    listed in the build manifest of each directory are copied to `output_dir`,
+    and their entries are added to its manifest. A shard only lists the files
+    that it owns, so each file is taken from the shard that converted it.
+
+    Returns `False` if two shards list the same input file with different
+    contents, which means they weren't run on the same inputs.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = BuildManifest(output_dir)
+    owners = {}
+    reports = []
+    success = True
+
+    for source in map(Path, sources):
+        if source.is_dir():
+            success &= merge_output(source, output_dir, manifest, owners)
+        elif source.suffix == ".json":
+            reports.append(source)
+        else:
+            print(f"Skipping {source} because it isn't a directory or a report...")
+
+    manifest.save()
+
+    if report is not None:
+        merge_reports(report, reports)
+        print(f"Merged {len(reports)} run report(s) into {report}")
+
+    return success
+
+
+def merge_output(source, output_dir, manifest, owners):
+    print(f"Merging {source.resolve()}...")
+
+    shard_manifest = BuildManifest(source)
+    if not shard_manifest.entries:
+        print(f"Skipping {source} because it has no usable build manifest...")
+        return True
+
+    success = True
+    for input_name, entry in sorted(shard_manifest.entries.items()):
+        # Written by a different version, so there's no output to merge.
+        if "output" not in entry:
+            continue
+
+        owner = owners.get(input_name)
+        if owner is not None:
+            if owner[1] != entry["sha256"]:
+                print(
+                    f"{input_name} was converted from different contents in "
+                    f"{owner[0]} and {source}, keeping the first..."
+                )
+                success = False
+            continue
+
+        rendered_file = source / entry["output"]
+        if not rendered_file.exists():
+            print(f"Skipping {rendered_file} because it doesn't exist...")
+            continue
+
+        if source.resolve() != output_dir.resolve():
+            write_if_changed(
+                output_dir / rendered_file.name, rendered_file.read_text("utf-8")
+            )
+
+        manifest.update(
+            input_name, entry["sha256"], rendered_file, entry.get("lastmod")
+        )
+        owners[input_name] = (source, entry["sha256"])
+
+    return success
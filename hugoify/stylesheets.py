@@ -0,0 +1,26 @@
+from functools import lru_cache
+from pathlib import Path
+from lxml import etree
+
+from .instrument import timed
+
+XSLT_DIR = (Path(__file__).resolve()).parent / "xslt"
+
+
+@lru_cache(maxsize=None)
+def get_stylesheet(name):
+    """Load and compile one of the bundled stylesheets, e.g. `frontmatter`.
+
+    Stylesheets are only compiled the first time they're requested, and the
+    compiled `etree.XSLT` is kept for the lifetime of the process, so each
+    worker process compiles a stylesheet at most once.
+    """
+    return etree.XSLT(etree.parse(str(XSLT_DIR / f"{name}.xslt")))
+
+
+@timed
+def render_frontmatter(document, lastmod=None):
+    frontmatter = get_stylesheet("frontmatter")
+    return str(
+        frontmatter(document, lastmod=etree.XSLT.strparam(lastmod or ""))
+    ).lstrip()
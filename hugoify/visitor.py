@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+from .xpaths import xpath
+
+
+class TreeVisitor:
+    """Run a set of per-element rules with a single walk of a tree.
+
+    Each rule is registered for a tag, with an optional predicate that is
+    either a callable or an XPath expression evaluated against the element.
+    `visit` collects every element that has a rule in one pass over the tree,
+    then calls the handlers of each element in document order, in the order
+    they were registered.
+
+    Predicates are checked just before their handler is called, so they see
+    the changes made by the handlers of earlier elements.
+    """
+
+    def __init__(self):
+        self._rules = defaultdict(list)
+
+    def register(self, tag, handler, predicate=None):
+        if isinstance(predicate, str):
+            predicate = _xpath_predicate(predicate)
+
+        self._rules[tag].append((predicate, handler))
+
+    def rule(self, tag, predicate=None):
+        def decorator(handler):
+            self.register(tag, handler, predicate)
+            return handler
+
+        return decorator
+
+    def visit(self, root):
+        if not self._rules:
+            return
+
+        # Handlers may move or remove elements, so the matches are collected
+        # before any of them are called.
+        matches = [
+            (elem, self._rules[elem.tag])
+            for elem in root.iter(*self._rules)
+            if elem is not root
+        ]
+
+        for elem, rules in matches:
+            for predicate, handler in rules:
+                if predicate is None or predicate(elem):
+                    handler(elem)
+
+
+def _xpath_predicate(path):
+    path = f"boolean({path})"
+
+    def predicate(elem):
+        return xpath(elem, path)
+
+    return predicate
@@ -0,0 +1,67 @@
+import time
+from pathlib import Path
+
+DEFAULT_INTERVAL = 0.5
+
+
+class FileWatcher:
+    """Poll `directory` for changes to the files matching `pattern`.
+
+    Changes are found by comparing the modification time and size of each file
+    between scans, so nothing but `stat` is needed.
+    """
+
+    def __init__(self, directory, pattern="*_api.xml"):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+
+        for f in self.directory.glob(self.pattern):
+            try:
+                stat = f.stat()
+            except FileNotFoundError:
+                continue
+
+            snapshot[f] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def poll(self):
+        """Return the files that were changed and removed since the last poll."""
+        snapshot = self.scan()
+
+        changed = sorted(
+            f for f, stat in snapshot.items() if self.snapshot.get(f) != stat
+        )
+        removed = sorted(f for f in self.snapshot if f not in snapshot)
+
+        self.snapshot = snapshot
+        return changed, removed
+
+
+def watch(render, input_dir, interval=DEFAULT_INTERVAL, watcher=None):
+    """Call `render(changed, removed)` whenever files in `input_dir` change.
+
+    Runs until interrupted, in the same process, so the compiled stylesheets
+    and XPath queries are reused by every render. If `watcher` is given, the
+    changes are found relative to its snapshot, e.g. one taken before an
+    initial build, so files edited while it ran are rendered again.
+    """
+    if watcher is None:
+        watcher = FileWatcher(input_dir)
+    print(f"Watching {Path(input_dir).resolve()} for changes...")
+
+    try:
+        while True:
+            time.sleep(interval)
+
+            changed, removed = watcher.poll()
+            if changed or removed:
+                start = time.perf_counter()
+                render(changed, removed)
+                print(f"Updated in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("Stopped watching...")
@@ -0,0 +1,38 @@
+from collections import Counter
+from lxml import etree
+
+_compiled = {}
+_hits = Counter()
+
+
+def compile_xpath(path):
+    """Return the compiled `etree.XPath` for `path`, compiling it only once."""
+    try:
+        return _compiled[path]
+    except KeyError:
+        query = _compiled[path] = etree.XPath(path)
+        return query
+
+
+def xpath(elem, path):
+    """Evaluate `path` against `elem`, like `elem.xpath(path)`.
+
+    Every expression is compiled the first time it's used, and the compiled
+    query is reused for the lifetime of the process.
+    """
+    _hits[path] += 1
+    return compile_xpath(path)(elem)
+
+
+def reset_hits():
+    _hits.clear()
+
+
+def format_report(limit=None):
+    """Summarize how often each XPath expression was evaluated."""
+    lines = [f"XPath queries: {sum(_hits.values())} ({len(_compiled)} compiled)"]
+
+    for path, count in _hits.most_common(limit):
+        lines.append(f"  {count:>8}  {path}")
+
+    return "\n".join(lines)
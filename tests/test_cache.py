@@ -0,0 +1,38 @@
+import os, sys
+from pathlib import Path
+
+import hugoify
+from hugoify.cache import BuildManifest, get_fingerprint
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT / "benchmarks"))
+import fixtures
+
+
+def render(input_file, output_dir, fingerprint):
+    manifest = BuildManifest(output_dir, fingerprint=fingerprint)
+    results = hugoify.render_files(
+        [input_file], input_file.parent, output_dir, manifest
+    )
+    assert not any(_.failed for _ in results)
+    return results
+
+
+def test_lastmod_survives_a_different_version(tmp_path):
+    input_file = tmp_path / "py_api.xml"
+    output_dir = tmp_path / "output"
+    fixtures.write(input_file, "py", classes=1, methods=1)
+
+    old_version = {**get_fingerprint(), "version": "0.0.0"}
+    render(input_file, output_dir, old_version)
+    page = (output_dir / "py_api.md").read_text()
+    lastmod = BuildManifest(output_dir, old_version).entries["py_api.xml"]["lastmod"]
+
+    # A fresh checkout gives the unchanged input a new modification time.
+    os.utime(input_file, (0, 0))
+
+    # The new version renders the page again, with the same timestamp.
+    assert len(render(input_file, output_dir, None)) == 1
+    assert (output_dir / "py_api.md").read_text() == page
+    assert BuildManifest(output_dir).entries["py_api.xml"]["lastmod"] == lastmod
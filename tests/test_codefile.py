@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from lxml import etree
+
+import hugoify
+
+DATA = Path(__file__).resolve().parent / "data"
+
+
+def test_nested_c_struct_is_kept_in_its_parent():
+    root = etree.parse(str(DATA / "c_nested_api.xml")).getroot()
+    contents = hugoify.CodeFile(root.find("section"))
+    contents.parse()
+    doc = hugoify.build_document(contents)
+
+    structs = doc.xpath("//desc[@objtype='struct']")
+    parents = [_.getparent().get("id") for _ in structs]
+    ids = [_.find("desc_signature").get("ids") for _ in structs]
+
+    # The nested struct is listed in the structs section, and a copy of it
+    # stays inside the struct it belongs to.
+    assert sorted(ids) == [
+        "c.widget_point",
+        "c.widget_point.inner",
+        "c.widget_point.inner",
+    ]
+    assert parents.count("structs") == 2
@@ -0,0 +1,21 @@
+import shutil
+from pathlib import Path
+
+import hugoify
+from hugoify.cache import BuildManifest
+
+DATA = Path(__file__).resolve().parent / "data"
+
+
+def test_report_counts_deepcopies(tmp_path):
+    input_file = tmp_path / "c_api.xml"
+    shutil.copy(DATA / "c_nested_api.xml", input_file)
+    output_dir = tmp_path / "output"
+
+    results = hugoify.render_files(
+        [input_file], tmp_path, output_dir, BuildManifest(output_dir)
+    )
+    report = results[0].value.to_dict()
+
+    # The struct nested in another one is copied into the structs section.
+    assert report["deepcopies"] == 1
@@ -0,0 +1,81 @@
+import sys
+import shutil
+from pathlib import Path
+
+import pytest
+
+import hugoify
+from hugoify.cache import BuildManifest, hash_file
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT / "benchmarks"))
+import fixtures
+
+
+def write_inputs(input_dir, classes):
+    input_dir.mkdir(exist_ok=True)
+    for domain in fixtures.DOMAINS:
+        fixtures.write(
+            input_dir / f"{domain}_api.xml", domain, classes=classes, methods=2
+        )
+
+
+def run(monkeypatch, input_dir, output_dir, *argv):
+    monkeypatch.setenv("INPUT_RAWPATH", str(input_dir))
+    monkeypatch.setenv("INPUT_OUTPUTPATH", str(output_dir))
+
+    with pytest.raises(SystemExit) as exc:
+        hugoify.main(list(argv))
+
+    return exc.value.code
+
+
+def test_merge_after_inputs_change(tmp_path, monkeypatch):
+    input_dir = tmp_path / "input"
+    previous = tmp_path / "previous"
+
+    write_inputs(input_dir, classes=2)
+    assert run(monkeypatch, input_dir, previous) == 0
+
+    # Every input changes, and each shard starts from the previous full build.
+    write_inputs(input_dir, classes=3)
+    shards = []
+    for index in (1, 2):
+        shard_dir = tmp_path / f"shard{index}"
+        shutil.copytree(previous, shard_dir)
+        assert run(monkeypatch, input_dir, shard_dir, "--shard", f"{index}/2") == 0
+        shards.append(str(shard_dir))
+
+    merged = tmp_path / "merged"
+    assert run(monkeypatch, input_dir, merged, "merge", *shards) == 0
+
+    expected = tmp_path / "expected"
+    assert run(monkeypatch, input_dir, expected) == 0
+
+    entries = BuildManifest(merged).entries
+    assert sorted(entries) == sorted(_.name for _ in input_dir.iterdir())
+    for input_file in input_dir.iterdir():
+        entry = entries[input_file.name]
+        assert entry["sha256"] == hash_file(input_file)
+        assert (merged / entry["output"]).read_text() == (
+            expected / entry["output"]
+        ).read_text()
+
+
+def test_merge_rejects_conflicting_shards(tmp_path, monkeypatch):
+    input_dir = tmp_path / "input"
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+
+    write_inputs(input_dir, classes=2)
+    assert run(monkeypatch, input_dir, first) == 0
+    write_inputs(input_dir, classes=3)
+    assert run(monkeypatch, input_dir, second) == 0
+
+    merged = tmp_path / "merged"
+    assert run(monkeypatch, input_dir, merged, "merge", str(first), str(second)) == 1
+
+    # The first source wins, so the output matches its manifest entries.
+    entries = BuildManifest(merged).entries
+    assert entries == BuildManifest(first).entries
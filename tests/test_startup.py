@@ -0,0 +1,52 @@
+import os, sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that are only needed on some paths, so they're imported lazily.
+LAZY_MODULES = (
+    "argparse",
+    "json",
+    "datetime",
+    "cProfile",
+    "tracemalloc",
+    "concurrent.futures",
+    "queue",
+    "ruamel",
+)
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_lazy_modules_are_not_imported():
+    proc = run_python(
+        "-c",
+        "import sys, hugoify\n"
+        f"print(' '.join(_ for _ in {LAZY_MODULES!r} if _ in sys.modules))",
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.split() == []
+
+
+# Wall-clock timings are too noisy on shared CI runners, so the budget is only
+# checked when asked for.
+@pytest.mark.skipif(
+    not os.getenv("HUGOIFY_STARTUP_BUDGET"),
+    reason="set HUGOIFY_STARTUP_BUDGET to check the import time budget",
+)
+def test_import_time_budget():
+    proc = run_python(str(ROOT / "benchmarks" / "startup.py"), "--runs", "7")
+
+    assert proc.returncode == 0, proc.stdout + proc.stderr
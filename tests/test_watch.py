@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+import hugoify
+from hugoify.cache import BuildManifest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT / "benchmarks"))
+import fixtures
+
+
+def test_rebuild_after_inputs_are_removed(tmp_path, monkeypatch):
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    for domain in fixtures.DOMAINS:
+        fixtures.write(input_dir / f"{domain}_api.xml", domain, classes=1, methods=1)
+
+    rebuilds = []
+
+    def watch(render, input_dir, interval=None, watcher=None):
+        # One input is removed, and another one is deleted right after the
+        # poll found it, before it could be read.
+        (input_dir / "c_api.xml").unlink()
+        render([input_dir / "gone_api.xml"], [input_dir / "c_api.xml"])
+        rebuilds.append(True)
+
+    monkeypatch.setattr(hugoify, "watch", watch)
+    monkeypatch.setenv("INPUT_RAWPATH", str(input_dir))
+    monkeypatch.setenv("INPUT_OUTPUTPATH", str(output_dir))
+
+    with pytest.raises(SystemExit) as exc:
+        hugoify.main(["--watch"])
+
+    assert exc.value.code == 0
+    assert rebuilds
+    assert sorted(_.name for _ in output_dir.glob("*.md")) == [
+        "cpp_api.md",
+        "py_api.md",
+    ]
+    assert sorted(BuildManifest(output_dir).entries) == ["cpp_api.xml", "py_api.xml"]